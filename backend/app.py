@@ -1,20 +1,32 @@
 # AgriTech Flask Backend API
 # Main application entry point
 
-from flask import Flask, request, jsonify
+from flask import Flask, g, request
+import orjson
 from flask_cors import CORS
+from flask_compress import Compress
 import joblib
+import xgboost as xgb
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import date, datetime
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+import zlib
+import atexit
+import time
 import calendar
 import os
+from types import MappingProxyType
 import logging
 from dotenv import load_dotenv
 
 # Import our services
 from app.services import WeatherService, AgmarknetService, TranslationService
-from app.utils import ModelEnhancer
+from app.schemas import (
+    ForecastBatchRequest, ForecastRequest, RecommendRequest, ValidationError, validation_errors
+)
+from app.utils import ModelEnhancer, forecast_prices, score_crops, warmup_kernels
 
 # Load environment variables
 load_dotenv()
@@ -22,19 +34,206 @@ load_dotenv()
 app = Flask(__name__)
 CORS(app)  # Enable CORS for frontend integration
 
+# Compress JSON responses (forecast and recommendation lists are highly repetitive)
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_MIN_SIZE'] = 500
+app.config['COMPRESS_LEVEL'] = 4  # gzip level
+app.config['COMPRESS_BR_LEVEL'] = 4
+Compress(app)
+
 # Initialize services
 weather_service = WeatherService()
 market_service = AgmarknetService()
 translation_service = TranslationService()
 
+# Keep weather for frequently requested districts warm off the request path
+weather_service.start_background_refresh()
+atexit.register(weather_service.close)
+
+# Runs weather lookups alongside CPU work within a request
+io_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='io')
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@app.before_request
+def _stamp_request_time():
+    """Format the request timestamp once; responses reuse g.now_iso"""
+    g.now_iso = datetime.now().isoformat()
+
+def ojsonify(obj, status=200):
+    """
+    Serialize a response with orjson (handles NumPy scalars and arrays natively)
+    """
+    return app.response_class(
+        orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS),
+        status=status,
+        mimetype='application/json'
+    )
+
 # =============================================================================
 # MODEL AND DATA LOADING
 # =============================================================================
 
+# Simplified crop and state encodings and their reverse lookups
+CROPS = ('Rice', 'Wheat', 'Maize', 'Cotton', 'Sugarcane',
+         'Onion', 'Potato', 'Tomato', 'Soybean', 'Groundnut')
+STATES = ('Maharashtra', 'Karnataka', 'Andhra Pradesh', 'Tamil Nadu',
+          'Gujarat', 'Rajasthan', 'Madhya Pradesh', 'Uttar Pradesh')
+
+CROP_TO_ID = MappingProxyType({crop: i for i, crop in enumerate(CROPS)})
+ID_TO_CROP = MappingProxyType(dict(enumerate(CROPS)))
+STATE_TO_ID = MappingProxyType({state: i for i, state in enumerate(STATES)})
+ID_TO_STATE = MappingProxyType(dict(enumerate(STATES)))
+
+# Crop suitability matrix based on season and region
+_CROP_SUITABILITY = MappingProxyType({
+    'Rice': {
+        'seasons': frozenset([6, 7, 8, 9, 10, 11]),  # Monsoon + Post-monsoon
+        'states': frozenset(['West Bengal', 'Punjab', 'Andhra Pradesh', 'Tamil Nadu', 'Karnataka']),
+        'base_score': 85
+    },
+    'Wheat': {
+        'seasons': frozenset([11, 12, 1, 2, 3, 4]),  # Rabi season
+        'states': frozenset(['Punjab', 'Haryana', 'Uttar Pradesh', 'Madhya Pradesh', 'Rajasthan']),
+        'base_score': 82
+    },
+    'Cotton': {
+        'seasons': frozenset([6, 7, 8, 9, 10]),  # Kharif season
+        'states': frozenset(['Gujarat', 'Maharashtra', 'Andhra Pradesh', 'Punjab', 'Haryana']),
+        'base_score': 78
+    },
+    'Sugarcane': {
+        'seasons': frozenset(range(1, 13)),  # Year-round
+        'states': frozenset(['Uttar Pradesh', 'Maharashtra', 'Karnataka', 'Tamil Nadu']),
+        'base_score': 75
+    },
+    'Maize': {
+        'seasons': frozenset([6, 7, 8, 9, 10]),  # Kharif season
+        'states': frozenset(['Karnataka', 'Andhra Pradesh', 'Tamil Nadu', 'Rajasthan']),
+        'base_score': 72
+    },
+    'Onion': {
+        'seasons': frozenset([6, 7, 8, 9, 11, 12, 1]),  # Kharif + Rabi
+        'states': frozenset(['Maharashtra', 'Karnataka', 'Gujarat', 'Madhya Pradesh']),
+        'base_score': 70
+    },
+    'Potato': {
+        'seasons': frozenset([10, 11, 12, 1, 2, 3]),  # Rabi season
+        'states': frozenset(['Uttar Pradesh', 'West Bengal', 'Bihar', 'Punjab']),
+        'base_score': 68
+    },
+    'Tomato': {
+        'seasons': frozenset([6, 7, 8, 9, 10, 11, 12]),  # Extended season
+        'states': frozenset(['Karnataka', 'Andhra Pradesh', 'Maharashtra', 'Gujarat']),
+        'base_score': 65
+    },
+    'Soybean': {
+        'seasons': frozenset([6, 7, 8, 9]),  # Monsoon season
+        'states': frozenset(['Madhya Pradesh', 'Maharashtra', 'Rajasthan']),
+        'base_score': 74
+    },
+    'Groundnut': {
+        'seasons': frozenset([6, 7, 8, 9]),  # Monsoon season
+        'states': frozenset(['Gujarat', 'Andhra Pradesh', 'Tamil Nadu', 'Karnataka']),
+        'base_score': 71
+    }
+})
+
+# Structure-of-arrays view of the suitability matrix for vectorized scoring
+_CROP_NAMES = tuple(_CROP_SUITABILITY)
+_BASE_SCORES = np.array([data['base_score'] for data in _CROP_SUITABILITY.values()], dtype=np.float64)
+_SUITABILITY_STATES = tuple(sorted(set().union(*(data['states'] for data in _CROP_SUITABILITY.values()))))
+_SUITABILITY_STATE_IDS = MappingProxyType({state: i for i, state in enumerate(_SUITABILITY_STATES)})
+# Per-crop bitmasks: bit `month` of _SEASON_MASK, bit `state_id` of _STATE_MASK
+_SEASON_MASK = np.array([sum(1 << m for m in data['seasons'])
+                         for data in _CROP_SUITABILITY.values()], dtype=np.uint16)
+_STATE_MASK = np.array([sum(1 << _SUITABILITY_STATE_IDS[s] for s in data['states'])
+                        for data in _CROP_SUITABILITY.values()], dtype=np.uint64)
+
+# Expected yield (tonnes per hectare)
+_YIELD_ESTIMATES = MappingProxyType({
+    'Rice': 4.2, 'Wheat': 3.5, 'Maize': 3.1, 'Cotton': 2.1,
+    'Sugarcane': 75.0, 'Onion': 20.0, 'Potato': 25.0,
+    'Tomato': 28.0, 'Soybean': 1.8, 'Groundnut': 2.2
+})
+
+# Explanation shown for each recommended crop (depends only on the crop)
+_REC_REASONS = {
+    'Rice': 'Ideal for monsoon season with adequate water supply',
+    'Wheat': 'Perfect for winter season (Rabi crop)',
+    'Cotton': 'Suitable for warm, humid monsoon conditions',
+    'Sugarcane': 'Year-round crop with steady income potential',
+    'Maize': 'Good monsoon crop with moderate water needs',
+    'Onion': 'Dual season crop with good market demand',
+    'Potato': 'Cold-weather crop with excellent storage potential',
+    'Tomato': 'High-value crop with extended growing season',
+    'Soybean': 'Nitrogen-fixing legume ideal for monsoon',
+    'Groundnut': 'Oil seed crop suitable for sandy soils'
+}
+
+# Per-row (same order as _CROP_NAMES) yield and reason, so the top-N
+# recommendations are plain tuple indexing
+_YIELD_BY_ROW = tuple(_YIELD_ESTIMATES.get(crop, 2.0) for crop in _CROP_NAMES)
+_REASON_BY_ROW = tuple(_REC_REASONS.get(crop, 'Suitable crop for the region') for crop in _CROP_NAMES)
+
+# Random market factor used when a crop's price history is unavailable
+_FALLBACK_RNG = np.random.default_rng()
+
+def _build_seasonal_lut(peak_months, peak_factor, off_factor):
+    """Build a 12-entry month -> seasonal price factor table"""
+    lut = np.full(12, off_factor)
+    lut[[m - 1 for m in peak_months]] = peak_factor
+    return lut
+
+# Seasonal price factors used by the price forecast kernel
+_SEASONAL_LUTS = {
+    'Rice': _build_seasonal_lut([10, 11, 12, 1, 2], 1.1, 0.95),  # Rabi crops
+    'Wheat': _build_seasonal_lut([10, 11, 12, 1, 2], 1.1, 0.95),
+    'Cotton': _build_seasonal_lut([3, 4, 5], 1.05, 1.0),  # Cash crops
+}
+_DEFAULT_SEASONAL_LUT = _build_seasonal_lut([6, 7, 8, 9], 1.08, 0.92)  # Vegetables and others
+
+def _seasonal_lut(crop_name):
+    """Get the seasonal factor table for a crop"""
+    return _SEASONAL_LUTS.get(crop_name, _DEFAULT_SEASONAL_LUT)
+
+@lru_cache(maxsize=256)
+def _forecast_series(crop_name, base_price, days, day_bucket, weather_factor):
+    """
+    Memoized (date, price, day name) forecast rows for one crop and day
+    
+    The volatility draw is seeded from (crop, day) so repeated requests on the
+    same day return the same series. Rows are tuples so cached entries can't be
+    mutated by callers.
+    """
+    # Forecast dates as datetime64 day offsets from day_bucket (an ordinal date)
+    idx = np.arange(1, days + 1, dtype=np.int32)
+    future_dates = np.datetime64(date.fromordinal(day_bucket), 'D') + idx
+    months = (future_dates.astype('datetime64[M]').astype(np.int64) % 12 + 1).astype(np.int8)
+    weekdays = (future_dates.astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday
+    
+    # Random market volatility (3% standard deviation), drawn in one call
+    rng = np.random.default_rng((zlib.crc32(crop_name.encode()), day_bucket))
+    volatility = rng.normal(0, 0.03, days)
+    
+    # Calculate predicted prices with seasonal, trend and weather
+    # adjustments plus the price floor
+    prices = forecast_prices(
+        base_price, months, idx, volatility,
+        _seasonal_lut(crop_name), weather_factor, np.empty(days)
+    )
+    
+    return tuple(
+        (day, round(price, 2), calendar.day_name[weekday])
+        for day, price, weekday in zip(
+            np.datetime_as_string(future_dates, unit='D').tolist(),
+            prices.tolist(),
+            weekdays.tolist()
+        )
+    )
+
 class AgriTechAPI:
     """
     Main API class for AgriTech ML models with enhanced features
@@ -48,45 +247,52 @@ class AgriTechAPI:
         self.state_mappings = {}
         self.model_enhancer = ModelEnhancer()
         self.load_models()
+        warmup_kernels()
         
     def load_models(self):
         """
         Load trained models and data processor
         """
         try:
-            # Try to load models from files
-            if os.path.exists('price_forecast_model.pkl'):
-                self.price_model = joblib.load('price_forecast_model.pkl')
+            # Try to load models from files (native UBJSON, or older pickles)
+            self.price_model = self._load_xgb_model(xgb.XGBRegressor, 'price_forecast_model')
+            if self.price_model is not None:
                 logger.info("✅ Price forecasting model loaded")
             
-            if os.path.exists('crop_recommendation_model.pkl'):
-                self.crop_model = joblib.load('crop_recommendation_model.pkl')
+            self.crop_model = self._load_xgb_model(xgb.XGBClassifier, 'crop_recommendation_model')
+            if self.crop_model is not None:
                 logger.info("✅ Crop recommendation model loaded")
             
             if os.path.exists('data_processor.pkl'):
                 self.processor = joblib.load('data_processor.pkl')
                 logger.info("✅ Data processor loaded")
             
-            # Create simplified crop and state mappings
-            self.crop_mappings = {
-                'Rice': 0, 'Wheat': 1, 'Maize': 2, 'Cotton': 3, 'Sugarcane': 4,
-                'Onion': 5, 'Potato': 6, 'Tomato': 7, 'Soybean': 8, 'Groundnut': 9
-            }
-            
-            self.state_mappings = {
-                'Maharashtra': 0, 'Karnataka': 1, 'Andhra Pradesh': 2, 'Tamil Nadu': 3,
-                'Gujarat': 4, 'Rajasthan': 5, 'Madhya Pradesh': 6, 'Uttar Pradesh': 7
-            }
+            # Simplified crop and state mappings (shared, precomputed at import)
+            self.crop_mappings = CROP_TO_ID
+            self.state_mappings = STATE_TO_ID
             
             # Reverse mappings
-            self.crop_mappings_reverse = {v: k for k, v in self.crop_mappings.items()}
-            self.state_mappings_reverse = {v: k for k, v in self.state_mappings.items()}
+            self.crop_mappings_reverse = ID_TO_CROP
+            self.state_mappings_reverse = ID_TO_STATE
             
             logger.info("✅ Models loaded successfully!")
             
         except Exception as e:
             logger.error(f"❌ Error loading models: {e}")
             
+    @staticmethod
+    def _load_xgb_model(model_cls, name):
+        """
+        Load `<name>.ubj` saved by the pipeline, falling back to `<name>.pkl`
+        """
+        if os.path.exists(f'{name}.ubj'):
+            model = model_cls()
+            model.load_model(f'{name}.ubj')
+            return model
+        if os.path.exists(f'{name}.pkl'):
+            return joblib.load(f'{name}.pkl')
+        return None
+            
     def predict_crop_prices(self, crop_name, days=15, district=None):
         """
         Predict crop prices with weather and market data enhancement
@@ -100,79 +306,49 @@ class AgriTechAPI:
             list: List of price predictions with weather and market context
         """
         try:
-            # Base prices for different crops (INR per quintal)
-            base_prices = {
-                'Rice': 2200, 'Wheat': 1950, 'Maize': 1650, 'Cotton': 5200,
-                'Sugarcane': 350, 'Onion': 1400, 'Potato': 900, 'Tomato': 1800,
-                'Soybean': 4200, 'Groundnut': 4800
-            }
+            # Base prices (INR per quintal) are shared with the market service,
+            # with a default price for unknown crops
+            base_price = market_service.base_prices.get(crop_name, 2000)
             
-            if crop_name not in base_prices:
-                # Default price for unknown crops
-                base_price = 2000
-            else:
-                base_price = base_prices[crop_name]
+            # Get weather adjustment if district is provided (same for every day)
+            weather_factor = 1.0
+            weather_context = None
+            if district:
+                try:
+                    weather_data = weather_service.get_weather_by_district(district)
+                    if weather_data:
+                        # Adjust based on weather conditions
+                        temp = weather_data.get('temperature', 25)
+                        rainfall = weather_data.get('rainfall', 0)
+                        
+                        # Temperature impact
+                        if temp > 35 or temp < 15:  # Extreme temperatures
+                            weather_factor *= 0.95
+                        
+                        # Rainfall impact
+                        if rainfall > 50:  # Heavy rain
+                            weather_factor *= 0.9
+                        
+                        weather_context = {
+                            'temperature': weather_data.get('temperature'),
+                            'rainfall': weather_data.get('rainfall'),
+                            'impact': 'negative' if weather_factor < 1 else 'positive'
+                        }
+                except Exception as e:
+                    logger.error(f"Weather data error: {e}")
             
-            forecasts = []
-            current_date = datetime.now()
+            # Same crop, day and weather -> same series (served from the memo)
+            forecasts = [
+                {'date': day, 'price': price, 'day': day_name}
+                for day, price, day_name in _forecast_series(
+                    crop_name, float(base_price), days, date.today().toordinal(), weather_factor
+                )
+            ]
             
-            for i in range(1, days + 1):
-                future_date = current_date + timedelta(days=i)
-                
-                # Seasonal factor
-                month = future_date.month
-                if crop_name in ['Rice', 'Wheat']:  # Rabi crops
-                    seasonal_factor = 1.1 if month in [10, 11, 12, 1, 2] else 0.95
-                elif crop_name in ['Cotton']:  # Cash crops
-                    seasonal_factor = 1.05 if month in [3, 4, 5] else 1.0
-                else:  # Vegetables and others
-                    seasonal_factor = 1.08 if month in [6, 7, 8, 9] else 0.92
-                
-                # Market trend (slight upward trend)
-                trend_factor = 1 + (i * 0.002)  # 0.2% increase per day
-                
-                # Random market volatility
-                volatility = np.random.normal(0, 0.03)  # 3% standard deviation
-                
-                # Get weather adjustment if district is provided
-                weather_factor = 1.0
-                if district:
-                    try:
-                        weather_data = weather_service.get_weather_by_district(district)
-                        if weather_data:
-                            # Adjust based on weather conditions
-                            temp = weather_data.get('temperature', 25)
-                            rainfall = weather_data.get('rainfall', 0)
-                            
-                            # Temperature impact
-                            if temp > 35 or temp < 15:  # Extreme temperatures
-                                weather_factor *= 0.95
-                            
-                            # Rainfall impact
-                            if rainfall > 50:  # Heavy rain
-                                weather_factor *= 0.9
-                    except Exception as e:
-                        logger.error(f"Weather data error: {e}")
-                
-                # Calculate predicted price with weather adjustment
-                predicted_price = base_price * seasonal_factor * trend_factor * weather_factor * (1 + volatility)
-                predicted_price = max(predicted_price, base_price * 0.7)  # Price floor
-                
-                forecast_entry = {
-                    'date': future_date.strftime('%Y-%m-%d'),
-                    'price': round(predicted_price, 2),
-                    'day': future_date.strftime('%A')
-                }
-                
-                # Add weather context if available
-                if district and weather_data:
-                    forecast_entry['weather_context'] = {
-                        'temperature': weather_data.get('temperature'),
-                        'rainfall': weather_data.get('rainfall'),
-                        'impact': 'negative' if weather_factor < 1 else 'positive'
-                    }
-                
-                forecasts.append(forecast_entry)
+            # Add weather context if available
+            if weather_context:
+                for forecast_entry in forecasts:
+                    forecast_entry['weather_context'] = dict(weather_context)
             
             # Enhance with market data if available
             if district:
@@ -192,6 +368,22 @@ class AgriTechAPI:
             logger.error(f"Error in price prediction: {e}")
             return []
     
+    def predict_crop_prices_batch(self, requests):
+        """
+        Predict crop prices for several requests at once
+        
+        Identical (crop, days, district) requests are computed only once.
+        
+        Args:
+            requests (list): List of (crop_name, days, district) tuples
+            
+        Returns:
+            list: One list of price predictions per request, in order
+        """
+        results = {key: cached_predict_crop_prices(*key) for key in dict.fromkeys(requests)}
+        # Each request gets its own dicts so responses can't share mutable state
+        return [[dict(p) for p in results[key]] for key in requests]
+    
     def recommend_crops(self, state=None, month=None, district=None):
         """
         Recommend best crops based on location, season, and current weather
@@ -205,182 +397,146 @@ class AgriTechAPI:
             list: List of recommended crops with scores and weather context
         """
         try:
-            # Crop suitability matrix based on season and region
-            crop_suitability = {
-                'Rice': {
-                    'seasons': [6, 7, 8, 9, 10, 11],  # Monsoon + Post-monsoon
-                    'states': ['West Bengal', 'Punjab', 'Andhra Pradesh', 'Tamil Nadu', 'Karnataka'],
-                    'base_score': 85
-                },
-                'Wheat': {
-                    'seasons': [11, 12, 1, 2, 3, 4],  # Rabi season
-                    'states': ['Punjab', 'Haryana', 'Uttar Pradesh', 'Madhya Pradesh', 'Rajasthan'],
-                    'base_score': 82
-                },
-                'Cotton': {
-                    'seasons': [6, 7, 8, 9, 10],  # Kharif season
-                    'states': ['Gujarat', 'Maharashtra', 'Andhra Pradesh', 'Punjab', 'Haryana'],
-                    'base_score': 78
-                },
-                'Sugarcane': {
-                    'seasons': list(range(1, 13)),  # Year-round
-                    'states': ['Uttar Pradesh', 'Maharashtra', 'Karnataka', 'Tamil Nadu'],
-                    'base_score': 75
-                },
-                'Maize': {
-                    'seasons': [6, 7, 8, 9, 10],  # Kharif season
-                    'states': ['Karnataka', 'Andhra Pradesh', 'Tamil Nadu', 'Rajasthan'],
-                    'base_score': 72
-                },
-                'Onion': {
-                    'seasons': [6, 7, 8, 9, 11, 12, 1],  # Kharif + Rabi
-                    'states': ['Maharashtra', 'Karnataka', 'Gujarat', 'Madhya Pradesh'],
-                    'base_score': 70
-                },
-                'Potato': {
-                    'seasons': [10, 11, 12, 1, 2, 3],  # Rabi season
-                    'states': ['Uttar Pradesh', 'West Bengal', 'Bihar', 'Punjab'],
-                    'base_score': 68
-                },
-                'Tomato': {
-                    'seasons': [6, 7, 8, 9, 10, 11, 12],  # Extended season
-                    'states': ['Karnataka', 'Andhra Pradesh', 'Maharashtra', 'Gujarat'],
-                    'base_score': 65
-                },
-                'Soybean': {
-                    'seasons': [6, 7, 8, 9],  # Monsoon season
-                    'states': ['Madhya Pradesh', 'Maharashtra', 'Rajasthan'],
-                    'base_score': 74
-                },
-                'Groundnut': {
-                    'seasons': [6, 7, 8, 9],  # Monsoon season
-                    'states': ['Gujarat', 'Andhra Pradesh', 'Tamil Nadu', 'Karnataka'],
-                    'base_score': 71
-                }
-            }
+            # Season/state bit indices for the scoring kernel (0 / -1 skip a term,
+            # -2 marks a state outside the suitability table)
+            state_id = _SUITABILITY_STATE_IDS.get(state, -2) if state else -1
             
-            recommendations = []
+            # Current weather affects every crop equally; fetch it while the
+            # market factors are computed
+            weather_future = io_executor.submit(self._get_weather_impact, district) if district else None
+            market_factors = self._get_market_factors(district or state)
+            weather_impact = weather_future.result() if weather_future else 0
             
-            for crop, data in crop_suitability.items():
-                score = data['base_score']
-                
-                # Season suitability
-                if month and month in data['seasons']:
-                    score += 15
-                elif month:
-                    score -= 10
-                
-                # State suitability
-                if state and state in data['states']:
-                    score += 10
-                elif state:
-                    score -= 5
-                
-                # Get weather data if district is provided
-                weather_impact = 0
-                weather_context = None
-                if district:
-                    try:
-                        weather_data = weather_service.get_weather_by_district(district)
-                        if weather_data:
-                            temp = weather_data.get('temperature', 25)
-                            humidity = weather_data.get('humidity', 60)
-                            rainfall = weather_data.get('rainfall', 0)
-                            
-                            # Temperature impact
-                            if 20 <= temp <= 30:
-                                weather_impact += 10
-                            elif temp < 15 or temp > 35:
-                                weather_impact -= 15
-                                
-                            # Humidity impact
-                            if 50 <= humidity <= 70:
-                                weather_impact += 5
-                            elif humidity > 90:
-                                weather_impact -= 10
-                                
-                            # Rainfall impact
-                            if 0 <= rainfall <= 30:
-                                weather_impact += 8
-                            elif rainfall > 100:
-                                weather_impact -= 12
-                                
-                            weather_context = {
-                                'temperature': temp,
-                                'humidity': humidity,
-                                'rainfall': rainfall,
-                                'impact': 'positive' if weather_impact > 0 else 'negative'
-                            }
-                    except Exception as e:
-                        logger.error(f"Weather data error in crop recommendation: {e}")
-                
-                # Add weather impact to score
-                score += weather_impact
-                
-                # Add market conditions
-                try:
-                    market_data = market_service.get_price_history(crop, district or state)
-                    if market_data:
-                        recent_trend = market_data[-1]['price'] - market_data[0]['price']
-                        market_factor = 5 if recent_trend > 0 else -5
-                        score += market_factor
-                except Exception as e:
-                    logger.error(f"Market data error: {e}")
-                    market_factor = np.random.uniform(-5, 5)
-                    score += market_factor
-                
-                # Ensure score is within reasonable bounds
-                score = max(30, min(100, score))
-                
-                # Calculate expected yield and profit
-                yield_estimates = {
-                    'Rice': 4.2, 'Wheat': 3.5, 'Maize': 3.1, 'Cotton': 2.1,
-                    'Sugarcane': 75.0, 'Onion': 20.0, 'Potato': 25.0,
-                    'Tomato': 28.0, 'Soybean': 1.8, 'Groundnut': 2.2
-                }
-                
-                estimated_yield = yield_estimates.get(crop, 2.0)
-                
-                recommendations.append({
-                    'crop': crop,
-                    'suitability_score': round(score, 1),
-                    'estimated_yield': estimated_yield,
-                    'season_match': month in data['seasons'] if month else None,
-                    'region_suitable': state in data['states'] if state else None,
-                    'recommendation_reason': self._get_recommendation_reason(crop, month, state)
-                })
+            # Score every crop in one kernel call: base + season + state +
+            # weather + market conditions, clipped to reasonable bounds
+            n_crops = len(_CROP_NAMES)
+            season_hit = np.zeros(n_crops, dtype=bool)
+            state_hit = np.zeros(n_crops, dtype=bool)
+            scores = score_crops(
+                _BASE_SCORES, _SEASON_MASK, _STATE_MASK, int(month or 0), state_id,
+                float(weather_impact), market_factors,
+                season_hit, state_hit, np.empty(n_crops)
+            )
+            scores = np.round(scores, 1)
             
-            # Sort by suitability score
-            recommendations.sort(key=lambda x: x['suitability_score'], reverse=True)
+            # Top 5 recommendations by suitability score (stable for ties):
+            # partition out the 5th best score, then sort only the crops at or
+            # above it, which are already in table order
+            k = min(5, n_crops)
+            kth_best = np.partition(scores, n_crops - k)[n_crops - k]
+            candidates = np.flatnonzero(scores >= kth_best)
+            top = candidates[np.argsort(-scores[candidates], kind='stable')][:k]
             
-            return recommendations[:5]  # Return top 5 recommendations
+            return [
+                {
+                    'crop': _CROP_NAMES[i],
+                    'suitability_score': float(scores[i]),
+                    'estimated_yield': _YIELD_BY_ROW[i],
+                    'season_match': bool(season_hit[i]) if month else None,
+                    'region_suitable': bool(state_hit[i]) if state else None,
+                    'recommendation_reason': _REASON_BY_ROW[i]
+                }
+                for i in top.tolist()
+            ]
             
         except Exception as e:
             logger.error(f"Error in crop recommendation: {e}")
             return []
     
-    def _get_recommendation_reason(self, crop, month, state):
+    def _get_weather_impact(self, district):
         """
-        Generate explanation for crop recommendation
+        Score adjustment from current weather in the district
         """
-        reasons = {
-            'Rice': 'Ideal for monsoon season with adequate water supply',
-            'Wheat': 'Perfect for winter season (Rabi crop)',
-            'Cotton': 'Suitable for warm, humid monsoon conditions',
-            'Sugarcane': 'Year-round crop with steady income potential',
-            'Maize': 'Good monsoon crop with moderate water needs',
-            'Onion': 'Dual season crop with good market demand',
-            'Potato': 'Cold-weather crop with excellent storage potential',
-            'Tomato': 'High-value crop with extended growing season',
-            'Soybean': 'Nitrogen-fixing legume ideal for monsoon',
-            'Groundnut': 'Oil seed crop suitable for sandy soils'
-        }
-        
-        return reasons.get(crop, 'Suitable crop for the region')
+        weather_impact = 0
+        try:
+            weather_data = weather_service.get_weather_by_district(district)
+            if weather_data:
+                temp = weather_data.get('temperature', 25)
+                humidity = weather_data.get('humidity', 60)
+                rainfall = weather_data.get('rainfall', 0)
+                
+                # Temperature impact
+                if 20 <= temp <= 30:
+                    weather_impact += 10
+                elif temp < 15 or temp > 35:
+                    weather_impact -= 15
+                    
+                # Humidity impact
+                if 50 <= humidity <= 70:
+                    weather_impact += 5
+                elif humidity > 90:
+                    weather_impact -= 10
+                    
+                # Rainfall impact
+                if 0 <= rainfall <= 30:
+                    weather_impact += 8
+                elif rainfall > 100:
+                    weather_impact -= 12
+        except Exception as e:
+            logger.error(f"Weather data error in crop recommendation: {e}")
+        return weather_impact
+    
+    def _get_market_factors(self, market):
+        """
+        Score adjustment per crop from its recent market price trend
+        """
+        market_factors = np.empty(len(_CROP_NAMES))
+        for i, crop in enumerate(_CROP_NAMES):
+            try:
+                prices = market_service.get_price_series(crop, market)
+                if prices is not None and prices.size:
+                    recent_trend = prices[-1] - prices[0]
+                    market_factors[i] = 5 if recent_trend > 0 else -5
+                else:
+                    market_factors[i] = 0
+            except Exception as e:
+                logger.error(f"Market data error: {e}")
+                market_factors[i] = _FALLBACK_RNG.uniform(-5, 5)
+        return market_factors
 
 # Initialize API instance
 agritech_api = AgriTechAPI()
 
+# Endpoint results are cached per hour, like the weather service cache
+RESULT_CACHE_SECONDS = 3600
+
+class _EmptyResult(Exception):
+    """Raised inside the cached helpers so failed (empty) results aren't cached"""
+
+@lru_cache(maxsize=1024)
+def _cached_predict(crop, days, district, ts_bucket):
+    predictions = agritech_api.predict_crop_prices(crop, days, district)
+    if not predictions:
+        raise _EmptyResult()
+    return tuple(predictions)
+
+@lru_cache(maxsize=1024)
+def _cached_recommend(state, month, district, ts_bucket):
+    recommendations = agritech_api.recommend_crops(state, month, district)
+    if not recommendations:
+        raise _EmptyResult()
+    return tuple(recommendations)
+
+def cached_predict_crop_prices(crop, days, district):
+    """
+    predict_crop_prices served from an hourly LRU cache (fresh dicts per call)
+    """
+    try:
+        predictions = _cached_predict(crop, days, district, int(time.time() // RESULT_CACHE_SECONDS))
+    except _EmptyResult:
+        return []
+    return [dict(p) for p in predictions]
+
+def cached_recommend_crops(state, month, district):
+    """
+    recommend_crops served from an hourly LRU cache (fresh dicts per call)
+    """
+    try:
+        recommendations = _cached_recommend(state, month, district, int(time.time() // RESULT_CACHE_SECONDS))
+    except _EmptyResult:
+        return []
+    return [dict(r) for r in recommendations]
+
 # =============================================================================
 # API ENDPOINTS
 # =============================================================================
@@ -390,11 +546,12 @@ def home():
     """
     API home endpoint
     """
-    return jsonify({
+    return ojsonify({
         'message': 'AgriTech ML API - Empowering Farmers with Data-Driven Decisions',
         'version': '1.0',
         'endpoints': {
             'forecast_price': '/forecast-price',
+            'forecast_price_batch': '/forecast-price-batch',
             'recommend_crop': '/recommend-crop',
             'health_check': '/health'
         },
@@ -406,9 +563,9 @@ def health_check():
     """
     Health check endpoint
     """
-    return jsonify({
+    return ojsonify({
         'status': 'healthy',
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': g.now_iso,
         'models_loaded': True
     })
 
@@ -424,65 +581,75 @@ def forecast_price():
     }
     """
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True)
         
         if not data:
-            return jsonify({'error': 'No JSON data provided'}), 400
-        
-        crop = data.get('crop', '').strip()
-        days = data.get('days', 15)
+            return ojsonify({'error': 'No JSON data provided'}), 400
         
-        # Validation
-        if not crop:
-            return jsonify({'error': 'Crop name is required'}), 400
-        
-        if not isinstance(days, int) or days < 1 or days > 30:
-            return jsonify({'error': 'Days must be between 1 and 30'}), 400
+        try:
+            req = ForecastRequest.model_validate(data)
+        except ValidationError as e:
+            return ojsonify(validation_errors(e)), 400
         
-        # Extract language preference
-        lang = data.get('lang', 'en')
-        district = data.get('district', '')
+        crop, days, district, lang = req.crop, req.days, req.district, req.lang
         
         # Generate predictions with weather and market data
-        predictions = agritech_api.predict_crop_prices(crop, days, district)
+        predictions = cached_predict_crop_prices(crop, days, district)
         
         if not predictions:
             error_msg = 'Failed to generate predictions'
             if lang != 'en':
                 error_msg = translation_service.translate(error_msg, lang)
-            return jsonify({'error': error_msg}), 500
+            return ojsonify({'error': error_msg}), 500
+        
+        response = _build_forecast_response(crop, days, district, predictions, lang)
+        return ojsonify(response)
+        
+    except Exception as e:
+        logger.error(f"Error in forecast_price endpoint: {e}")
+        return ojsonify({'error': 'Internal server error'}), 500
+
+@app.route('/forecast-price-batch', methods=['POST'])
+def forecast_price_batch():
+    """
+    Price forecasts for several crops in one request
+    
+    Expected JSON payload:
+    {
+        "requests": [
+            {"crop": "Rice", "days": 15, "district": "Pune"},
+            {"crop": "Wheat", "days": 7}
+        ],
+        "lang": "en"  // Optional, applies to every result
+    }
+    """
+    try:
+        data = request.get_json(silent=True)
         
-        # Calculate summary statistics
-        prices = [p['price'] for p in predictions]
+        if not data:
+            return ojsonify({'error': 'No JSON data provided'}), 400
         
-        response = {
-            'crop': crop,
-            'forecast_days': days,
-            'district': district if district else 'General',
-            'predictions': predictions,
-            'summary': {
-                'average_price': round(np.mean(prices), 2),
-                'min_price': round(min(prices), 2),
-                'max_price': round(max(prices), 2),
-                'price_trend': 'increasing' if prices[-1] > prices[0] else 'decreasing',
-                'volatility': round(np.std(prices), 2)
-            },
-            'generated_at': datetime.now().isoformat()
-        }
+        try:
+            batch = ForecastBatchRequest.model_validate(data)
+        except ValidationError as e:
+            return ojsonify(validation_errors(e)), 400
         
-        # Translate response if needed
-        if lang != 'en':
-            try:
-                response = translation_service.translate_response(response, lang)
-            except Exception as e:
-                logger.error(f"Translation error: {e}")
-                # Continue with English response
+        keys = [(req.crop, req.days, req.district) for req in batch.requests]
+        lang = batch.lang
+        
+        # One batched call for every forecast in the request
+        results = []
+        for (crop, days, district), predictions in zip(keys, agritech_api.predict_crop_prices_batch(keys)):
+            if predictions:
+                results.append(_build_forecast_response(crop, days, district, predictions, lang))
+            else:
+                results.append({'crop': crop, 'error': 'Failed to generate predictions'})
         
-        return jsonify(response)
+        return ojsonify({'results': results, 'generated_at': g.now_iso})
         
     except Exception as e:
-        logger.error(f"Error in forecast_price endpoint: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+        logger.error(f"Error in forecast_price_batch endpoint: {e}")
+        return ojsonify({'error': 'Internal server error'}), 500
 
 @app.route('/recommend-crop', methods=['POST'])
 def recommend_crop():
@@ -498,32 +665,19 @@ def recommend_crop():
     """
     logger.info("Received recommend-crop request")
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True)
         
         if not data:
-            return jsonify({'error': 'No JSON data provided'}), 400
+            return ojsonify({'error': 'No JSON data provided'}), 400
         
-        # Get parameters with defaults
-        mode = 'location_based'  # Default mode
-        state = data.get('state', '')
-        state = state.strip() if state else ''
-        crop = data.get('crop', '').strip() if data.get('crop') else ''
+        # Providing a crop switches to crop analysis mode, otherwise a state is
+        # required; month defaults to the current month
+        try:
+            req = RecommendRequest.model_validate(data)
+        except ValidationError as e:
+            return ojsonify(validation_errors(e)), 400
         
-        if crop:
-            mode = 'crop_analysis'  # Switch to crop analysis mode if crop is provided
-            if not crop:
-                return jsonify({'error': 'Crop name is required for crop analysis mode'}), 400
-        else:
-            # Location-based mode validation
-            if not state:
-                return jsonify({'error': 'State is required for location-based mode'}), 400
-            
-        month = data.get('month', datetime.now().month)
-        if month is not None and (not isinstance(month, int) or month < 1 or month > 12):
-            return jsonify({'error': 'Month must be between 1 and 12'}), 400
-            
-        district = data.get('district')
-        district = district.strip() if district else ''
+        mode, state, crop, month, district = req.mode, req.state, req.crop, req.month, req.district
         
         logger.info(f"Mode: {mode}, State: {state}, Crop: {crop}, Month: {month}, District: {district}")
         
@@ -532,11 +686,11 @@ def recommend_crop():
             if mode == 'location_based':
                 # Get location-based recommendations
                 logger.info(f"Getting location-based recommendations for state: {state}, month: {month}, district: {district}")
-                recommendations = agritech_api.recommend_crops(state, month, district)
+                recommendations = cached_recommend_crops(state, month, district)
                 
                 if not recommendations:
                     logger.error("Failed to generate location-based recommendations")
-                    return jsonify({'error': 'Failed to generate recommendations'}), 500
+                    return ojsonify({'error': 'Failed to generate recommendations'}), 500
                 
                 response = {
                     'mode': 'location_based',
@@ -546,18 +700,19 @@ def recommend_crop():
                     'district': district if district else 'General',
                     'recommendations': recommendations,
                     'season': _get_season_name(month),
-                    'generated_at': datetime.now().isoformat()
+                    'generated_at': g.now_iso
                 }
             else:
                 # Get crop analysis
                 logger.info(f"Getting crop analysis for crop: {crop}, state: {state}")
-                crop_data = agritech_api.recommend_crops(state, month, district)
+                crop_data = cached_recommend_crops(state, month, district)
                 
                 # Find the specific crop data
-                crop_recommendation = next((rec for rec in crop_data if rec['crop'] == crop), None)
+                by_crop = {rec['crop']: rec for rec in crop_data}
+                crop_recommendation = by_crop.get(crop)
                 if not crop_recommendation:
                     logger.error(f"Failed to find analysis for crop: {crop}")
-                    return jsonify({'error': f'Failed to analyze crop: {crop}'}), 500
+                    return ojsonify({'error': f'Failed to analyze crop: {crop}'}), 500
                 
                 # Get market analysis with enhanced analysis
                 try:
@@ -589,7 +744,7 @@ def recommend_crop():
                         'confidence_score': 50,
                         'price_range': {'min': 0, 'max': 0, 'avg': 0},
                         'future_outlook': 'neutral',
-                        'last_updated': datetime.now().isoformat()
+                        'last_updated': g.now_iso
                     }
                 
                 response = {
@@ -602,45 +757,82 @@ def recommend_crop():
                         'recommendation_reason': crop_recommendation['recommendation_reason']
                     },
                     'market_outlook': market_outlook,
-                    'generated_at': datetime.now().isoformat()
+                    'generated_at': g.now_iso
                 }
             
             logger.info(f"Generated response successfully: {response}")
-            return jsonify(response)
+            return ojsonify(response)
             
         except Exception as e:
             logger.error(f"Error generating response: {e}")
-            return jsonify({'error': str(e)}), 500
+            return ojsonify({'error': str(e)}), 500
         
-        return jsonify(response)
+        return ojsonify(response)
         
     except Exception as e:
         logger.error(f"Error in recommend_crop endpoint: {e}")
-        return jsonify({'error': str(e)}), 500
+        return ojsonify({'error': str(e)}), 500
             # Crop analysis mode
 
 
         
-        return jsonify(response)
+        return ojsonify(response)
         
     except Exception as e:
         logger.error(f"Error in recommend_crop endpoint: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return ojsonify({'error': 'Internal server error'}), 500
 
 # =============================================================================
 # UTILITY FUNCTIONS
 # =============================================================================
 
+def _build_forecast_response(crop, days, district, predictions, lang='en'):
+    """
+    Build the forecast response (with summary statistics) for one crop
+    """
+    # Calculate summary statistics from a single array of prices
+    prices = np.fromiter((p['price'] for p in predictions), dtype=np.float64, count=len(predictions))
+    
+    response = {
+        'crop': crop,
+        'forecast_days': days,
+        'district': district if district else 'General',
+        'predictions': predictions,
+        'summary': {
+            'average_price': round(float(prices.mean()), 2),
+            'min_price': round(float(prices.min()), 2),
+            'max_price': round(float(prices.max()), 2),
+            'price_trend': 'increasing' if prices[-1] > prices[0] else 'decreasing',
+            'volatility': round(float(prices.std()), 2)
+        },
+        'generated_at': g.now_iso
+    }
+    
+    # Translate response if needed
+    if lang != 'en':
+        try:
+            response = translation_service.translate_response(response, lang)
+        except Exception as e:
+            logger.error(f"Translation error: {e}")
+            # Continue with English response
+    
+    return response
+
+# Season for each month (index 0 unused)
+_SEASON_BY_MONTH = (
+    None,
+    'Winter', 'Winter',                          # Jan, Feb
+    'Summer', 'Summer', 'Summer',                # Mar - May
+    'Monsoon', 'Monsoon', 'Monsoon', 'Monsoon',  # Jun - Sep
+    'Post-Monsoon', 'Post-Monsoon',              # Oct, Nov
+    'Winter'                                     # Dec
+)
+
 def _get_season_name(month):
     """Get season name from month"""
-    if month in [12, 1, 2]:
-        return 'Winter'
-    elif month in [3, 4, 5]:
-        return 'Summer'
-    elif month in [6, 7, 8, 9]:
-        return 'Monsoon'
-    else:
-        return 'Post-Monsoon'
+    if 1 <= month <= 12:
+        return _SEASON_BY_MONTH[month]
+    return 'Post-Monsoon'
 
 # Add the method to the API class
 AgriTechAPI._get_season_name = staticmethod(_get_season_name)
@@ -667,6 +859,13 @@ def test_api_endpoints():
     for rec in test_recommendations[:3]:
         print(f"   {rec['crop']}: Score {rec['suitability_score']}")
     
+    # Test weather lookups (fetched concurrently)
+    print("\n🌦️ Testing District Weather:")
+    test_districts = ['Pune', 'Nagpur', 'Ludhiana']
+    test_weather = weather_service.get_weather_for_districts(test_districts)
+    for district, weather in test_weather.items():
+        print(f"   {district}: {weather['temperature'] if weather else 'unavailable'}")
+    
     print("\n✅ API tests completed!")
 
 if __name__ == '__main__':
@@ -678,5 +877,5 @@ if __name__ == '__main__':
     print("📡 API will be available at: http://localhost:5000")
     print("📖 API documentation: http://localhost:5000")
     
-    # Run in debug mode for development
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    # Run in debug mode for development (use gunicorn_conf.py in production)
+    app.run(debug=os.getenv('FLASK_ENV', 'development') != 'production', host='0.0.0.0', port=5000)
@@ -0,0 +1,116 @@
+from typing import List, Optional
+from datetime import datetime
+from pydantic import BaseModel, ConfigDict, Field, StrictInt, ValidationError, field_validator, model_validator
+
+# Maximum number of forecasts accepted by /forecast-price-batch
+MAX_BATCH_REQUESTS = 20
+
+# Error messages per field, kept from the hand-written validation
+FIELD_MESSAGES = {
+    'crop': 'Crop name is required',
+    'days': 'Days must be between 1 and 30',
+    'month': 'Month must be between 1 and 12'
+}
+
+
+class _Request(BaseModel):
+    """Base for request payloads: strip strings, ignore unknown fields"""
+    model_config = ConfigDict(str_strip_whitespace=True, extra='ignore')
+
+
+class ForecastRequest(_Request):
+    """
+    Payload for /forecast-price (and each entry of /forecast-price-batch)
+    """
+    crop: str = Field(min_length=1)
+    days: StrictInt = Field(15, ge=1, le=30)
+    district: str = ''
+    lang: str = 'en'
+
+    @field_validator('district', 'lang', mode='before')
+    @classmethod
+    def _none_to_default(cls, value, info):
+        if value is None:
+            return cls.model_fields[info.field_name].default
+        return value
+
+
+class ForecastBatchRequest(_Request):
+    """
+    Payload for /forecast-price-batch
+    """
+    requests: List[ForecastRequest] = Field(min_length=1, max_length=MAX_BATCH_REQUESTS)
+    lang: str = 'en'
+
+
+class RecommendRequest(_Request):
+    """
+    Payload for /recommend-crop
+
+    Location-based mode needs a state; providing a crop switches to crop analysis.
+    An omitted month means the current month, an explicit null means no month
+    (crop analysis only).
+    """
+    state: str = ''
+    crop: str = ''
+    month: Optional[StrictInt] = Field(default_factory=lambda: datetime.now().month, ge=1, le=12)
+    district: str = ''
+
+    @field_validator('state', 'crop', 'district', mode='before')
+    @classmethod
+    def _none_to_empty(cls, value):
+        return '' if value is None else value
+
+    @model_validator(mode='after')
+    def _check_mode(self):
+        if not self.crop:
+            if not self.state:
+                raise ValueError('State is required for location-based mode')
+            if self.month is None:
+                raise ValueError(FIELD_MESSAGES['month'])
+        return self
+
+    @property
+    def mode(self) -> str:
+        return 'crop_analysis' if self.crop else 'location_based'
+
+
+def _error_message(error: dict) -> str:
+    """Map one Pydantic error to the message the endpoints returned before Pydantic"""
+    loc = error['loc']
+    if not loc:
+        return error['msg'].removeprefix('Value error, ')
+    if loc[0] == 'requests':
+        if len(loc) == 1:
+            if error['type'] == 'too_long':
+                return f'At most {MAX_BATCH_REQUESTS} requests per batch'
+            return 'requests must be a non-empty list'
+        if len(loc) == 2:
+            return f'requests[{loc[1]}] must be an object'
+        return f"requests[{loc[1]}]: {_error_message({**error, 'loc': loc[2:]})}"
+    if loc[0] in FIELD_MESSAGES:
+        return FIELD_MESSAGES[loc[0]]
+    location = '.'.join(str(part) for part in loc)
+    return f"{location}: {error['msg']}"
+
+
+def validation_errors(error: ValidationError) -> dict:
+    """
+    Error payload for a failed validation: the message for the first problem
+    plus the full list of errors
+    """
+    errors = error.errors(include_url=False, include_context=False, include_input=False)
+    return {
+        'error': _error_message(errors[0]),
+        'errors': errors
+    }
+
+
+__all__ = [
+    'MAX_BATCH_REQUESTS',
+    'ForecastRequest',
+    'ForecastBatchRequest',
+    'RecommendRequest',
+    'ValidationError',
+    'validation_errors'
+]
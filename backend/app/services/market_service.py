@@ -1,9 +1,42 @@
 from typing import Dict, Optional, List
-from datetime import datetime, timedelta
-import random
+from datetime import date, datetime
+from functools import lru_cache
+import hashlib
+import threading
 import numpy as np
 import pandas as pd
 from prophet import Prophet
+from cachetools import TTLCache
+
+# One PCG64 generator per process for the mock market data
+_RNG = np.random.default_rng()
+
+@lru_cache(maxsize=256)
+def _mock_price_arrays(base_price, peak_months, lean_months, days, day_ordinal):
+    """
+    Mock price history as read-only arrays (dates as datetime64[D], prices and
+    arrivals as float32), generated once per commodity and day
+    """
+    # Dates from the given day backwards, one per day
+    dates = np.datetime64(date.fromordinal(day_ordinal), 'D') - np.arange(days)
+    months = dates.astype('datetime64[M]').astype(np.int64) % 12 + 1
+    
+    # Seasonal adjustment: 10-30% higher in peak season, 10-30% lower in lean season
+    is_peak = np.isin(months, peak_months)
+    is_lean = np.isin(months, lean_months)
+    low = np.where(is_peak, 1.1, np.where(is_lean, 0.7, 0.9))
+    seasonal_factor = _RNG.uniform(low, low + 0.2)
+    
+    # Add some random market variation (±10%)
+    market_variation = _RNG.uniform(-0.1, 0.1, days)
+    
+    # Calculate final prices
+    prices = (base_price * seasonal_factor * (1 + market_variation)).astype(np.float32)
+    arrivals = _RNG.uniform(100, 1000, days).astype(np.float32)
+    
+    for array in (dates, prices, arrivals):
+        array.flags.writeable = False
+    return dates, prices, arrivals
 
 class AgmarknetService:
     def __init__(self):
@@ -21,16 +54,16 @@ class AgmarknetService:
             'Groundnut': 4800
         }
         self.seasonal_factors = {
-            'Rice': {'peak_months': [11, 12, 1], 'lean_months': [5, 6, 7], 'demand': 'high', 'volatility': 'low'},
-            'Wheat': {'peak_months': [3, 4, 5], 'lean_months': [8, 9, 10], 'demand': 'high', 'volatility': 'low'},
-            'Maize': {'peak_months': [9, 10, 11], 'lean_months': [2, 3, 4], 'demand': 'moderate', 'volatility': 'moderate'},
-            'Cotton': {'peak_months': [10, 11, 12], 'lean_months': [4, 5, 6], 'demand': 'high', 'volatility': 'high'},
-            'Sugarcane': {'peak_months': [1, 2, 3], 'lean_months': [7, 8, 9], 'demand': 'moderate', 'volatility': 'low'},
-            'Onion': {'peak_months': [4, 5, 6], 'lean_months': [1, 2, 12], 'demand': 'high', 'volatility': 'very_high'},
-            'Potato': {'peak_months': [2, 3, 4], 'lean_months': [7, 8, 9], 'demand': 'high', 'volatility': 'moderate'},
-            'Tomato': {'peak_months': [6, 7, 8], 'lean_months': [1, 2, 12], 'demand': 'high', 'volatility': 'very_high'},
-            'Soybean': {'peak_months': [10, 11, 12], 'lean_months': [4, 5, 6], 'demand': 'moderate', 'volatility': 'high'},
-            'Groundnut': {'peak_months': [11, 12, 1], 'lean_months': [5, 6, 7], 'demand': 'moderate', 'volatility': 'moderate'}
+            'Rice': {'peak_months': frozenset({11, 12, 1}), 'lean_months': frozenset({5, 6, 7}), 'demand': 'high', 'volatility': 'low'},
+            'Wheat': {'peak_months': frozenset({3, 4, 5}), 'lean_months': frozenset({8, 9, 10}), 'demand': 'high', 'volatility': 'low'},
+            'Maize': {'peak_months': frozenset({9, 10, 11}), 'lean_months': frozenset({2, 3, 4}), 'demand': 'moderate', 'volatility': 'moderate'},
+            'Cotton': {'peak_months': frozenset({10, 11, 12}), 'lean_months': frozenset({4, 5, 6}), 'demand': 'high', 'volatility': 'high'},
+            'Sugarcane': {'peak_months': frozenset({1, 2, 3}), 'lean_months': frozenset({7, 8, 9}), 'demand': 'moderate', 'volatility': 'low'},
+            'Onion': {'peak_months': frozenset({4, 5, 6}), 'lean_months': frozenset({1, 2, 12}), 'demand': 'high', 'volatility': 'very_high'},
+            'Potato': {'peak_months': frozenset({2, 3, 4}), 'lean_months': frozenset({7, 8, 9}), 'demand': 'high', 'volatility': 'moderate'},
+            'Tomato': {'peak_months': frozenset({6, 7, 8}), 'lean_months': frozenset({1, 2, 12}), 'demand': 'high', 'volatility': 'very_high'},
+            'Soybean': {'peak_months': frozenset({10, 11, 12}), 'lean_months': frozenset({4, 5, 6}), 'demand': 'moderate', 'volatility': 'high'},
+            'Groundnut': {'peak_months': frozenset({11, 12, 1}), 'lean_months': frozenset({5, 6, 7}), 'demand': 'moderate', 'volatility': 'moderate'}
         }
         
         # Regional market strengths
@@ -64,46 +97,56 @@ class AgmarknetService:
                 'Rice': 1.15, 'Maize': 1.1
             }
         }
+        
+        # Fitted Prophet models keyed by a hash of their training data; the mock
+        # history only changes daily, so refits are skipped within a day
+        self.prophet_models = TTLCache(maxsize=64, ttl=24 * 3600)
+        self._prophet_lock = threading.Lock()
+    
+    def _price_arrays(self, commodity: str, days: int):
+        """
+        (dates, prices, arrivals) arrays of the mock price history, newest first
+        """
+        seasonal_info = self.seasonal_factors.get(commodity, {
+            'peak_months': frozenset({7, 8, 9}),
+            'lean_months': frozenset({1, 2, 3})
+        })
+        return _mock_price_arrays(
+            self.base_prices.get(commodity, 2000),
+            tuple(sorted(seasonal_info['peak_months'])),
+            tuple(sorted(seasonal_info['lean_months'])),
+            days,
+            date.today().toordinal()
+        )
+    
+    def get_price_series(self, commodity: str, market: str, days: int = 30) -> Optional[np.ndarray]:
+        """
+        Prices of get_price_history as a read-only float32 array (newest first),
+        for callers that only need the numbers
+        """
+        try:
+            return self._price_arrays(commodity, days)[1]
+        except Exception as e:
+            print(f"Error fetching market data: {str(e)}")
+            return None
     
     def get_price_history(self, commodity: str, market: str, days: int = 30) -> Optional[List[Dict]]:
         """
         Generate realistic mock historical price data using seasonal patterns
         """
         try:
-            base_price = self.base_prices.get(commodity, 2000)
-            end_date = datetime.now()
-            price_history = []
+            dates, prices, arrivals = self._price_arrays(commodity, days)
             
-            seasonal_info = self.seasonal_factors.get(commodity, {
-                'peak_months': [7, 8, 9],
-                'lean_months': [1, 2, 3]
-            })
-            
-            for i in range(days):
-                date = end_date - timedelta(days=i)
-                
-                # Seasonal adjustment
-                month = date.month
-                if month in seasonal_info['peak_months']:
-                    seasonal_factor = random.uniform(1.1, 1.3)  # 10-30% higher in peak season
-                elif month in seasonal_info['lean_months']:
-                    seasonal_factor = random.uniform(0.7, 0.9)  # 10-30% lower in lean season
-                else:
-                    seasonal_factor = random.uniform(0.9, 1.1)  # Normal variation
-                    
-                # Add some random market variation
-                market_variation = random.uniform(-0.1, 0.1)  # ±10% variation
-                
-                # Calculate final price
-                price = base_price * seasonal_factor * (1 + market_variation)
-                
-                price_history.append({
-                    'date': date.strftime('%Y-%m-%d'),
+            price_history = [
+                {
+                    'date': day,
                     'price': round(price, 2),
                     'min_price': round(price * 0.9, 2),
                     'max_price': round(price * 1.1, 2),
-                    'arrivals': round(random.uniform(100, 1000), 2)
-                })
+                    'arrivals': round(arrival, 2)
+                }
+                for day, price, arrival in zip(dates.astype(str).tolist(), prices.tolist(), arrivals.tolist())
+            ]
             
             return price_history
             
@@ -116,22 +159,24 @@ class AgmarknetService:
         Get comprehensive market analysis for a crop in a specific state
         """
         try:
-            current_month = datetime.now().month
-            current_day = datetime.now().day
+            now = datetime.now()
+            current_month = now.month
+            current_day = now.day
             seasonal_info = self.seasonal_factors.get(crop, {})
             
             # Base demand calculation with daily variation
             base_demand = seasonal_info.get('demand', 'moderate')
             base_volatility = seasonal_info.get('volatility', 'moderate')
             
-            # Add daily randomization factor
+            # Add daily randomization factor (a local generator, so the daily
+            # seed doesn't reset the process-wide random state)
             daily_seed = int(f"{current_month}{current_day}")
-            random.seed(daily_seed)
-            daily_factor = random.uniform(0.8, 1.2)
+            rng = np.random.default_rng(daily_seed)
+            daily_factor = rng.uniform(0.8, 1.2)
             
             # Seasonal adjustment
-            is_peak_season = current_month in seasonal_info.get('peak_months', [])
-            is_lean_season = current_month in seasonal_info.get('lean_months', [])
+            is_peak_season = current_month in seasonal_info.get('peak_months', ())
+            is_lean_season = current_month in seasonal_info.get('lean_months', ())
             
             # Calculate demand with dynamic factors
             if is_peak_season:
@@ -150,10 +195,11 @@ class AgmarknetService:
                     demand = self._downgrade_level(demand)
                 
             # Generate dynamic regional factors
-            if state and state in self.regional_market_strength:
-                regional_strength = self.regional_market_strength[state].get(crop, 1.0)
+            state_strengths = self.regional_market_strength.get(state) if state else None
+            if state_strengths is not None:
+                regional_strength = state_strengths.get(crop, 1.0)
                 # Add daily variation to regional strength
-                regional_variation = random.uniform(-0.05, 0.05)
+                regional_variation = rng.uniform(-0.05, 0.05)
                 regional_strength = max(1.0, regional_strength + regional_variation)
                 
                 if regional_strength > 1.2:
@@ -165,7 +211,7 @@ class AgmarknetService:
                     competition = 'low'
             else:
                 regional_strength = 1.0
-                competition = ['low', 'moderate', 'high'][int(random.uniform(0, 3))]
+                competition = ['low', 'moderate', 'high'][int(rng.integers(3))]
                 
             # Dynamic price stability calculation
             stability_factors = []
@@ -181,7 +227,7 @@ class AgmarknetService:
                 stability_factors.append('volatile')
             
             # Market conditions factor
-            market_condition = random.uniform(0, 1)
+            market_condition = rng.uniform(0, 1)
             if market_condition > 0.8:  # 20% chance of additional volatility
                 stability_factors.append('volatile')
             
@@ -191,19 +237,14 @@ class AgmarknetService:
                 
             # Generate dynamic price history with trends
             base_price = self.base_prices.get(crop, 2000)
-            price_history = []
-            trend_factor = random.uniform(-0.2, 0.2)  # Random trend direction
+            trend_factor = rng.uniform(-0.2, 0.2)  # Random trend direction
+            seasonal_impact = 1.1 if is_peak_season else 0.9 if is_lean_season else 1.0
             
-            for i in range(30):
-                day_factor = 1.0 + (trend_factor * (i/30))  # Progressive trend
-                daily_noise = random.uniform(-0.05, 0.05)  # Daily variation
-                seasonal_impact = 1.1 if is_peak_season else 0.9 if is_lean_season else 1.0
-                
-                price = base_price * day_factor * (1 + daily_noise) * seasonal_impact
-                price_history.append({'price': price})
+            day_factor = 1.0 + trend_factor * (np.arange(30) / 30)  # Progressive trend
+            daily_noise = rng.uniform(-0.05, 0.05, 30)  # Daily variation
+            prices = base_price * day_factor * (1 + daily_noise) * seasonal_impact
             
             # Calculate trend and volatility
-            prices = [p['price'] for p in price_history]
             recent_prices = prices[-7:]  # Last week's prices
             
             # Dynamic trend calculation
@@ -220,18 +261,18 @@ class AgmarknetService:
                 
             # Calculate market confidence score
             confidence_factors = {
-                'data_quality': random.uniform(0.7, 1.0),
+                'data_quality': rng.uniform(0.7, 1.0),
                 'market_predictability': 0.8 if price_stability == 'stable' else 0.5,
                 'seasonal_certainty': 1.0 if is_peak_season or is_lean_season else 0.7
             }
             confidence_score = sum(confidence_factors.values()) / len(confidence_factors)
             
             # Calculate price range
-            avg_price = np.mean(prices)
+            avg_price = prices.mean()
             price_range = {
-                'min': round(min(recent_prices), 2),
-                'max': round(max(recent_prices), 2),
-                'avg': round(avg_price, 2)
+                'min': round(float(recent_prices.min()), 2),
+                'max': round(float(recent_prices.max()), 2),
+                'avg': round(float(avg_price), 2)
             }
             
             # Generate forward-looking forecast
@@ -252,11 +293,11 @@ class AgmarknetService:
                 'trend': trend,
                 'regional_strength': round((regional_strength - 1) * 100) if state else 0,
                 'seasonal_timing': 'peak' if is_peak_season else 'lean' if is_lean_season else 'normal',
-                'market_volatility': round(volatility, 2),
-                'confidence_score': round(confidence_score * 100),
+                'market_volatility': round(float(volatility), 2),
+                'confidence_score': round(float(confidence_score) * 100),
                 'price_range': price_range,
                 'future_outlook': future_outlook,
-                'analysis_timestamp': datetime.now().isoformat()
+                'analysis_timestamp': now.isoformat()
             }
             
         except Exception as e:
@@ -289,74 +330,90 @@ class AgmarknetService:
         except ValueError:
             return current_level
             
+    def _get_prophet_model(self, dates: np.ndarray, prices: np.ndarray, peak_months: tuple) -> Prophet:
+        """
+        Prophet model fitted on the given history, reused while the data is unchanged
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for part in (dates, prices, np.asarray(peak_months, dtype=np.int64)):
+            digest.update(np.ascontiguousarray(part).tobytes())
+        key = digest.hexdigest()
+        
+        with self._prophet_lock:
+            model = self.prophet_models.get(key)
+        if model is not None:
+            return model
+        
+        model = Prophet(
+            yearly_seasonality=True,
+            weekly_seasonality=True,
+            daily_seasonality=False,
+            seasonality_mode='multiplicative'
+        )
+        
+        # Add commodity-specific seasonality
+        for month in peak_months:
+            model.add_seasonality(
+                name=f'peak_month_{month}',
+                period=30.5,
+                fourier_order=5
+            )
+            
+        model.fit(pd.DataFrame({
+            'ds': dates.astype('datetime64[ns]'),
+            'y': prices.astype(np.float64)
+        }))
+        
+        with self._prophet_lock:
+            self.prophet_models[key] = model
+        return model
+    
     def enhance_forecast(self, prophet_forecast: Dict, commodity: str, market: str) -> Dict:
         """
         Enhance forecast using Prophet and market patterns
         """
         try:
-            # Get historical data
-            history = self.get_price_history(commodity, market, days=90)  # Get 90 days of history
-            if not history:
+            # Get historical data (newest first)
+            dates, prices, _ = self._price_arrays(commodity, 90)  # Get 90 days of history
+            if not prices.size:
                 return prophet_forecast
                 
-            # Prepare data for Prophet
-            df = pd.DataFrame(history)
-            df['ds'] = pd.to_datetime(df['date'])
-            df['y'] = df['price']
-            
-            # Initialize and fit Prophet model
-            model = Prophet(
-                yearly_seasonality=True,
-                weekly_seasonality=True,
-                daily_seasonality=False,
-                seasonality_mode='multiplicative'
-            )
-            
-            # Add commodity-specific seasonality
             seasonal_info = self.seasonal_factors.get(commodity, {})
-            if seasonal_info:
-                peak_months = seasonal_info.get('peak_months', [])
-                for month in peak_months:
-                    model.add_seasonality(
-                        name=f'peak_month_{month}',
-                        period=30.5,
-                        fourier_order=5
-                    )
-                    
-            model.fit(df)
+            model = self._get_prophet_model(dates, prices, tuple(sorted(seasonal_info.get('peak_months', ()))))
             
             # Make future dataframe
             if 'forecast' in prophet_forecast:
-                future_dates = pd.DataFrame([
-                    {'ds': datetime.strptime(p['date'], '%Y-%m-%d')}
-                    for p in prophet_forecast['forecast']
-                ])
+                future_dates = pd.DataFrame({
+                    'ds': pd.to_datetime([p['date'] for p in prophet_forecast['forecast']], format='%Y-%m-%d')
+                })
                 
                 # Predict
                 forecast = model.predict(future_dates)
                 
+                # Blend original and Prophet predictions in one vectorized pass
+                points = prophet_forecast['forecast']
+                orig_prices = np.fromiter((p['price'] for p in points), dtype=np.float64, count=len(points))
+                blended = np.round((orig_prices + forecast['yhat'].to_numpy()) / 2, 2).tolist()
+                lower = forecast['yhat_lower'].to_numpy().round(2).tolist()
+                upper = forecast['yhat_upper'].to_numpy().round(2).tolist()
+                
                 # Update original forecast with Prophet predictions
-                for i, point in enumerate(prophet_forecast['forecast']):
-                    orig_price = point['price']
-                    prophet_price = forecast.iloc[i]['yhat']
-                    
-                    # Blend original and Prophet predictions
-                    blended_price = (orig_price + prophet_price) / 2
-                    
-                    point['price'] = round(blended_price, 2)
-                    point['confidence_lower'] = round(forecast.iloc[i]['yhat_lower'], 2)
-                    point['confidence_upper'] = round(forecast.iloc[i]['yhat_upper'], 2)
+                for point, price, low, high in zip(points, blended, lower, upper):
+                    point['price'] = price
+                    point['confidence_lower'] = low
+                    point['confidence_upper'] = high
                     
                 # Add market insights
-                recent_prices = [h['price'] for h in history[:7]]  # Last 7 days
+                recent_prices = prices[:7].astype(np.float64)  # Last 7 days
+                current_month = datetime.now().month
                 prophet_forecast['market_insights'] = {
-                    'recent_average': round(np.mean(recent_prices), 2),
-                    'volatility': round(np.std(recent_prices), 2),
+                    'recent_average': round(float(recent_prices.mean()), 2),
+                    'volatility': round(float(recent_prices.std()), 2),
                     'trend': 'increasing' if forecast['trend'].iloc[-1] > forecast['trend'].iloc[0] else 'decreasing',
-                    'seasonal_pattern': 'peak' if datetime.now().month in seasonal_info.get('peak_months', [])
-                                      else 'lean' if datetime.now().month in seasonal_info.get('lean_months', [])
+                    'seasonal_pattern': 'peak' if current_month in seasonal_info.get('peak_months', ())
+                                      else 'lean' if current_month in seasonal_info.get('lean_months', ())
                                       else 'normal',
-                    'confidence_score': 'high' if len(history) >= 60 else 'medium'
+                    'confidence_score': 'high' if prices.size >= 60 else 'medium'
                 }
             
             return prophet_forecast
@@ -1,6 +1,6 @@
 from typing import Dict, Optional, Any
 import requests
-import json
+import orjson
 import os
 from pathlib import Path
 
@@ -23,8 +23,8 @@ class TranslationService:
         try:
             translation_file = os.path.join(os.path.dirname(__file__), 'common_translations.json')
             if os.path.exists(translation_file):
-                with open(translation_file, 'r', encoding='utf-8') as f:
-                    self.translations_cache = json.load(f)
+                with open(translation_file, 'rb') as f:
+                    self.translations_cache = orjson.loads(f.read())
         except Exception as e:
             print(f"Error loading translations: {str(e)}")
             
@@ -42,8 +42,9 @@ class TranslationService:
         text_key = text.strip()
         
         # Check common translations
-        if text_key in COMMON_TRANSLATIONS and target_lang in COMMON_TRANSLATIONS[text_key]:
-            return COMMON_TRANSLATIONS[text_key][target_lang]
+        translated = COMMON_TRANSLATIONS.get(text_key, {}).get(target_lang)
+        if translated is not None:
+            return translated
         
         # Return original text if no translation found
         return text
@@ -87,8 +88,9 @@ class TranslationService:
         """
         try:
             translation_file = os.path.join(os.path.dirname(__file__), 'common_translations.json')
-            with open(translation_file, 'w', encoding='utf-8') as f:
-                json.dump(self.translations_cache, f, ensure_ascii=False, indent=2)
+            # orjson always emits UTF-8 bytes, so no ensure_ascii handling is needed
+            with open(translation_file, 'wb') as f:
+                f.write(orjson.dumps(self.translations_cache, option=orjson.OPT_INDENT_2))
         except Exception as e:
             print(f"Error saving translations: {str(e)}")
             
@@ -1,18 +1,215 @@
 import os
+import asyncio
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+import httpx
+import orjson
 import requests
-from typing import Dict, Optional, Tuple
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, List, Optional, Tuple
+from datetime import timedelta
+from cachetools import LRUCache, TLRUCache, TTLCache
 from dotenv import load_dotenv
 
+try:
+    from diskcache import Cache as DiskCache
+except ImportError:  # diskcache is optional - weather is then cached per process only
+    DiskCache = None
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:  # h2 is optional - batch requests then use HTTP/1.1
+    HTTP2_AVAILABLE = False
+
 load_dotenv()
 
+def _build_session() -> requests.Session:
+    """
+    Session with pooled keep-alive connections, retrying transient failures
+    (rate limits, 5xx, dropped connections) with backoff
+    """
+    session = requests.Session()
+    retries = Retry(
+        total=3,
+        connect=2,
+        read=2,
+        backoff_factor=0.2,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({'GET'})
+    )
+    adapter = HTTPAdapter(max_retries=retries, pool_connections=20, pool_maxsize=100)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
 class WeatherService:
     def __init__(self):
         self.api_key = os.getenv('OPENWEATHERMAP_API_KEY')
-        self.base_url = "http://api.openweathermap.org/data/2.5/weather"
+        # HTTPS so the async batch client can negotiate HTTP/2
+        self.base_url = "https://api.openweathermap.org/data/2.5/weather"
+        self.geocoding_url = "https://api.openweathermap.org/geo/1.0/direct"
+        # Geocoding and weather calls share one pooled session; (connect, read)
+        # timeouts keep a stalled API from holding a worker
+        self.session = _build_session()
+        self.timeout = (2, 5)
+        # Geocoded district coordinates, keyed by normalized district name
+        self.district_coords = {}
+        self.cache_duration = timedelta(minutes=10)  # Weather changes slowly
+        self.failure_cache_duration = timedelta(seconds=60)  # Don't hammer a failing API
+        # Cache keys snap coordinates to this grid (~5 km); the API still gets exact coordinates
+        self.grid_deg = 0.05
+        # Bounds for the per-entry TTL (see _entry_ttl)
+        self.min_ttl = 60.0
+        self.max_ttl = 3600.0
+        # Parsed weather responses keyed by "lat,lon" and stored as (data, ttl),
+        # each expiring after its own TTL; failed lookups are remembered
+        # separately for a shorter time
+        self.cache = TLRUCache(maxsize=1024, ttu=lambda key, value, now: now + value[1])
+        self.failure_cache = TTLCache(maxsize=256, ttl=self.failure_cache_duration.total_seconds())
+        # Last good response per key, served (marked stale) while the API is failing
+        self.last_known = LRUCache(maxsize=1024)
+        # Smoothed upstream latency per ~10 km grid cell
+        self.latency_ema = {}
+        # On-disk copy of the weather cache, shared by workers and kept across
+        # restarts; the in-process cache above stays in front of it
+        self.disk_cache = None
+        if DiskCache is not None:
+            self.disk_cache = DiskCache(os.getenv('WEATHER_CACHE_DIR', 'weather_cache'), size_limit=64 << 20)
+        self._cache_lock = threading.Lock()  # TTLCache isn't thread-safe (background refresh)
+        # Upstream lookups in progress, so concurrent misses for the same key share one request
+        self._inflight: Dict[str, Future] = {}
+        self.schema_warnings = 0  # Malformed payloads seen (for rate-limited logging)
+        # Request counts per resolved district, used to pick districts to
+        # pre-warm; pruned to the most requested tracked_district_count on
+        # every refresh so it stays bounded
+        self.district_hits = Counter()
+        self.hot_district_count = 10
+        self.tracked_district_count = 100
+        self.refresh_interval = self.cache_duration.total_seconds()
+        self._hits_lock = threading.Lock()
+        self._refresh_thread = None
+    
+    def close(self):
+        """Release the pooled HTTP connections and the disk cache"""
+        self.session.close()
+        if self.disk_cache is not None:
+            self.disk_cache.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
         
     def get_weather_by_coords(self, lat: float, lon: float) -> Optional[Dict]:
         """
-        Fetch weather data for given coordinates
+        Fetch weather data for given coordinates, served from cache when fresh
+        """
+        cache_key = self._cache_key(lat, lon)
+        with self._cache_lock:
+            weather_data = self._cached(cache_key)
+            if weather_data is not None:
+                return weather_data
+            if cache_key in self.failure_cache:
+                return self._stale(cache_key)
+            inflight = self._inflight.get(cache_key)
+            if inflight is None:
+                future = self._inflight[cache_key] = Future()
+                
+        if inflight is not None:
+            return inflight.result()
+            
+        weather_data = None
+        try:
+            weather_data = self._load_persisted(cache_key)
+            if weather_data is None:
+                started = time.monotonic()
+                weather_data = self._fetch_weather_by_coords(lat, lon)
+                with self._cache_lock:
+                    weather_data = self._store(cache_key, weather_data, time.monotonic() - started)
+        finally:
+            with self._cache_lock:
+                del self._inflight[cache_key]
+            future.set_result(weather_data)
+        return weather_data
+    
+    def _load_persisted(self, cache_key: str) -> Optional[Dict]:
+        """
+        Weather for a key from the disk cache, copied into the in-process cache
+        for the rest of its lifetime
+        """
+        if self.disk_cache is None:
+            return None
+        try:
+            weather_data, expire_time = self.disk_cache.get(cache_key, expire_time=True)
+        except Exception as e:
+            print(f"Error reading weather disk cache: {str(e)}")
+            return None
+        if weather_data is None:
+            return None
+            
+        ttl = expire_time - time.time() if expire_time is not None else self.min_ttl
+        with self._cache_lock:
+            self.cache[cache_key] = (weather_data, max(ttl, 1.0))
+            self.last_known[cache_key] = weather_data
+        return weather_data
+    
+    def _cache_key(self, lat: float, lon: float) -> str:
+        """Cache key for coordinates, snapped to the grid_deg grid"""
+        return f"{round(lat / self.grid_deg) * self.grid_deg:.2f},{round(lon / self.grid_deg) * self.grid_deg:.2f}"
+    
+    def _cached(self, cache_key: str) -> Optional[Dict]:
+        """Fresh cached weather for a key, or None (call with _cache_lock held)"""
+        entry = self.cache.get(cache_key)
+        return entry[0] if entry is not None else None
+    
+    def _stale(self, cache_key: str) -> Optional[Dict]:
+        """Last good weather for a key, flagged as stale (call with _cache_lock held)"""
+        weather_data = self.last_known.get(cache_key)
+        return {**weather_data, 'is_stale': True} if weather_data is not None else None
+    
+    def _store(self, cache_key: str, weather_data: Optional[Dict], latency: float) -> Optional[Dict]:
+        """
+        Cache a fetch result (call with _cache_lock held)
+        
+        Returns:
+            The weather data, or the last good data marked stale if the fetch failed
+        """
+        if weather_data is None:
+            self.failure_cache[cache_key] = True
+            return self._stale(cache_key)
+        ttl = self._entry_ttl(cache_key, latency)
+        self.cache[cache_key] = (weather_data, ttl)
+        self.last_known[cache_key] = weather_data
+        if self.disk_cache is not None:
+            try:
+                self.disk_cache.set(cache_key, weather_data, expire=ttl)
+            except Exception as e:
+                print(f"Error writing weather disk cache: {str(e)}")
+        return weather_data
+    
+    def _entry_ttl(self, cache_key: str, latency: float) -> float:
+        """
+        TTL for a fresh response: the base cache duration plus twice the smoothed
+        upstream latency for the area, clamped to [min_ttl, max_ttl] and
+        shortened as the cache fills past 70%
+        """
+        lat, lon = (round(float(part), 1) for part in cache_key.split(','))
+        ema = self.latency_ema.get((lat, lon), latency)
+        ema = self.latency_ema[(lat, lon)] = 0.8 * ema + 0.2 * latency
+        
+        ttl = min(max(self.cache_duration.total_seconds() + 2.0 * ema, self.min_ttl), self.max_ttl)
+        fill = len(self.cache) / self.cache.maxsize
+        pressure = min(max((fill - 0.7) / 0.2, 0.0), 1.0)
+        return max(ttl * (1.0 - pressure), self.min_ttl)
+    
+    def _fetch_weather_by_coords(self, lat: float, lon: float) -> Optional[Dict]:
+        """
+        Fetch weather data for given coordinates from the API
         """
         try:
             params = {
@@ -21,45 +218,238 @@ class WeatherService:
                 'appid': self.api_key,
                 'units': 'metric'  # For Celsius
             }
-            response = requests.get(self.base_url, params=params)
+            response = self.session.get(self.base_url, params=params, timeout=self.timeout)
             response.raise_for_status()
-            data = response.json()
-            
-            return {
-                'temperature': data['main']['temp'],
-                'humidity': data['main']['humidity'],
-                'rainfall': data.get('rain', {}).get('1h', 0),  # Rain in last 1 hour
-                'description': data['weather'][0]['description']
-            }
+            data = orjson.loads(response.content)
         except Exception as e:
             print(f"Error fetching weather data: {str(e)}")
             return None
+            
+        return self._parse_weather(data)
     
-    def get_weather_by_district(self, district: str) -> Optional[Dict]:
+    def get_weather_batch(self, coords: List[Tuple[float, float]], refresh: bool = False) -> List[Optional[Dict]]:
         """
-        Fetch weather data for given district by first converting to coordinates
+        Fetch weather for several coordinates, requesting all cache misses
+        concurrently instead of one after another
+        
+        Args:
+            coords: List of (lat, lon) pairs
+            refresh: Skip the cache and re-fetch every coordinate
+            
+        Returns:
+            List of weather data (None where unavailable), in the order of coords
+        """
+        keys = [self._cache_key(lat, lon) for lat, lon in coords]
+        results = {}
+        misses = []
+        # Misses this call fetches (and resolves for others) vs. ones another
+        # caller is already fetching, shared through the same in-flight map as
+        # get_weather_by_coords
+        owned = {}
+        waiting = {}
+        with self._cache_lock:
+            for key, coord in zip(keys, coords):
+                if key in results:
+                    continue
+                weather_data = None if refresh else self._cached(key)
+                if weather_data is None and (refresh or key not in self.failure_cache):
+                    inflight = self._inflight.get(key)
+                    if inflight is not None:
+                        waiting[key] = inflight
+                    else:
+                        owned[key] = self._inflight[key] = Future()
+                        misses.append(coord)
+                elif weather_data is None:
+                    weather_data = self._stale(key)
+                results[key] = weather_data
+                    
+        try:
+            if misses and not refresh:
+                # Serve what other workers (or a previous run) already fetched
+                remaining = []
+                for lat, lon in misses:
+                    weather_data = self._load_persisted(self._cache_key(lat, lon))
+                    if weather_data is not None:
+                        results[self._cache_key(lat, lon)] = weather_data
+                    else:
+                        remaining.append((lat, lon))
+                misses = remaining
+                
+            if misses:
+                started = time.monotonic()
+                fetched = asyncio.run(self._fetch_weather_batch_async(misses))
+                latency = time.monotonic() - started
+                with self._cache_lock:
+                    for (lat, lon), weather_data in zip(misses, fetched):
+                        key = self._cache_key(lat, lon)
+                        results[key] = self._store(key, weather_data, latency)
+        finally:
+            with self._cache_lock:
+                for key in owned:
+                    del self._inflight[key]
+            for key, future in owned.items():
+                future.set_result(results[key])
+                
+        # Only wait on other callers after resolving our own keys, so two
+        # overlapping batches can't block each other
+        for key, future in waiting.items():
+            results[key] = future.result()
+                        
+        return [results[key] for key in keys]
+    
+    def get_weather_for_districts(self, districts: List[str]) -> Dict[str, Optional[Dict]]:
+        """
+        Fetch weather for several districts concurrently
+        """
+        coords = {}
+        for district in districts:
+            try:
+                district_coords = self.get_district_coords(district)
+            except Exception as e:
+                print(f"Error in district weather lookup: {str(e)}")
+                district_coords = None
+            if district_coords is not None:
+                coords[district] = district_coords
+                
+        weather = self.get_weather_batch(list(coords.values()))
+        by_district = dict(zip(coords, weather))
+        return {district: by_district.get(district) for district in districts}
+    
+    async def _fetch_weather_batch_async(self, coords: List[Tuple[float, float]]) -> List[Optional[Dict]]:
+        """
+        Fan out one request per coordinate over a shared async client,
+        multiplexed on a single HTTP/2 connection when h2 is installed
+        """
+        async with httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=httpx.Timeout(5.0, connect=2.0),
+            limits=httpx.Limits(max_connections=100)
+        ) as client:
+            return await asyncio.gather(*(self._fetch_weather_async(client, lat, lon) for lat, lon in coords))
+    
+    async def _fetch_weather_async(self, client, lat: float, lon: float) -> Optional[Dict]:
+        """
+        Async counterpart of _fetch_weather_by_coords
         """
         try:
-            # Geocoding API to convert district to coordinates
-            geocoding_url = f"http://api.openweathermap.org/geo/1.0/direct"
             params = {
-                'q': f"{district},IN",  # IN for India
-                'limit': 1,
-                'appid': self.api_key
+                'lat': lat,
+                'lon': lon,
+                'appid': self.api_key,
+                'units': 'metric'  # For Celsius
             }
-            
-            response = requests.get(geocoding_url, params=params)
+            response = await client.get(self.base_url, params=params)
             response.raise_for_status()
-            location_data = response.json()
+            data = orjson.loads(response.content)
+        except Exception as e:
+            print(f"Error fetching weather data: {str(e)}")
+            return None
+            
+        return self._parse_weather(data)
+    
+    def _parse_weather(self, data) -> Optional[Dict]:
+        """
+        Extract the fields we use from an OpenWeather payload, validating it once
+        instead of indexing and catching KeyError/IndexError
+        """
+        main = data.get('main') if isinstance(data, dict) else None
+        if not main or main.get('temp') is None:
+            # Rate-limit the warning so a partial outage doesn't flood the logs
+            if self.schema_warnings % 100 == 0:
+                print(f"Unexpected weather payload (seen {self.schema_warnings + 1} times)")
+            self.schema_warnings += 1
+            return None
+            
+        weather = data.get('weather') or [{}]
+        return {
+            'temperature': main['temp'],
+            'humidity': main.get('humidity'),
+            'rainfall': (data.get('rain') or {}).get('1h', 0),  # Rain in last 1 hour
+            'description': weather[0].get('description', '')
+        }
+    
+    def get_district_coords(self, district: str) -> Optional[Tuple[float, float]]:
+        """
+        Resolve a district to (lat, lon), geocoding each district only once
+        """
+        key = district.strip().casefold()
+        coords = self.district_coords.get(key)
+        if coords is not None:
+            return coords
             
-            if not location_data:
+        # Geocoding API to convert district to coordinates
+        params = {
+            'q': f"{district.strip()},IN",  # IN for India
+            'limit': 1,
+            'appid': self.api_key
+        }
+        
+        response = self.session.get(self.geocoding_url, params=params, timeout=self.timeout)
+        response.raise_for_status()
+        location_data = orjson.loads(response.content)
+        
+        if not location_data:
+            return None
+            
+        coords = (location_data[0]['lat'], location_data[0]['lon'])
+        self.district_coords[key] = coords
+        return coords
+    
+    def get_weather_by_district(self, district: str) -> Optional[Dict]:
+        """
+        Fetch weather data for given district by first converting to coordinates
+        """
+        try:
+            coords = self.get_district_coords(district)
+            if coords is None:
                 return None
-                
-            lat = location_data[0]['lat']
-            lon = location_data[0]['lon']
             
-            return self.get_weather_by_coords(lat, lon)
+            # Only districts that geocode count, so unknown names can't grow
+            # the counter or get pre-warmed
+            with self._hits_lock:
+                self.district_hits[district.strip().casefold()] += 1
+                
+            return self.get_weather_by_coords(*coords)
             
         except Exception as e:
             print(f"Error in district weather lookup: {str(e)}")
-            return None
\ No newline at end of file
+            return None
+    
+    def start_background_refresh(self):
+        """
+        Start a daemon thread that keeps the most-requested districts' weather
+        fresh, so requests for them are served from the cache
+        """
+        if self._refresh_thread is not None and self._refresh_thread.is_alive():
+            return
+        self._refresh_thread = threading.Thread(target=self._refresh_loop, name='weather-refresh', daemon=True)
+        self._refresh_thread.start()
+    
+    def _refresh_loop(self):
+        """Re-fetch weather for the hot districts once per refresh interval"""
+        next_run = time.monotonic() + self.refresh_interval
+        while True:
+            time.sleep(max(0.0, next_run - time.monotonic()))
+            next_run = time.monotonic() + self.refresh_interval
+            
+            with self._hits_lock:
+                tracked = self.district_hits.most_common(self.tracked_district_count)
+                self.district_hits = Counter(dict(tracked))
+                hot_districts = [d for d, _ in tracked[:self.hot_district_count]]
+                
+            # Resolve coordinates (memoized), then re-fetch all of them concurrently
+            coords = []
+            for district in hot_districts:
+                try:
+                    district_coords = self.get_district_coords(district)
+                except Exception as e:
+                    print(f"Error refreshing weather for {district}: {str(e)}")
+                    continue
+                if district_coords is not None:
+                    coords.append(district_coords)
+                    
+            if coords:
+                try:
+                    self.get_weather_batch(coords, refresh=True)
+                except Exception as e:
+                    print(f"Error refreshing weather: {str(e)}")
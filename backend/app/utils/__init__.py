@@ -1,3 +1,4 @@
 from .model_enhancer import ModelEnhancer
+from .kernels import forecast_prices, score_crops, warmup_kernels
 
-__all__ = ['ModelEnhancer']
\ No newline at end of file
+__all__ = ['ModelEnhancer', 'forecast_prices', 'score_crops', 'warmup_kernels']
\ No newline at end of file
@@ -0,0 +1,116 @@
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # Numba is optional - fall back to plain NumPy
+    njit = None
+    prange = range
+
+
+def _forecast_prices_loop(base_price, months, idx, vol, seasonal_lut, weather_factor, out):
+    """
+    Price forecast kernel (compiled with Numba when available)
+
+    Args:
+        base_price (float): Base crop price (INR per quintal)
+        months (int8[:]): Month (1-12) of each forecast day
+        idx (int32[:]): Day offset of each forecast day (1..days)
+        vol (float64[:]): Random market volatility per day
+        seasonal_lut (float64[12]): Seasonal factor for each month
+        weather_factor (float): Weather adjustment for the district
+        out (float64[:]): Output buffer for predicted prices
+    """
+    floor = base_price * 0.7  # Price floor
+    for i in prange(idx.size):
+        price = (base_price * seasonal_lut[months[i] - 1] * (1.0 + idx[i] * 0.002)
+                 * weather_factor * (1.0 + vol[i]))
+        out[i] = price if price > floor else floor
+    return out
+
+
+def _forecast_prices_numpy(base_price, months, idx, vol, seasonal_lut, weather_factor, out):
+    """NumPy implementation of the price forecast kernel"""
+    prices = base_price * seasonal_lut[months - 1] * (1.0 + idx * 0.002) * weather_factor * (1.0 + vol)
+    return np.maximum(prices, base_price * 0.7, out=out)
+
+
+if njit is not None:
+    # cache=True persists the compiled kernel between process restarts
+    forecast_prices = njit(cache=True, fastmath=True)(_forecast_prices_loop)
+else:
+    forecast_prices = _forecast_prices_numpy
+
+
+def _score_crops_loop(base, season_mask, state_mask, month, state_id, weather_impact, market,
+                      season_hit, state_hit, out):
+    """
+    Crop suitability scoring kernel (compiled with Numba when available)
+    
+    Args:
+        base (float64[:]): Base score of each crop
+        season_mask (uint16[:]): Bit `month` set when the crop suits that month
+        state_mask (uint64[:]): Bit `state_id` set when the crop suits that state
+        month (int): Month (1-12), or 0 to skip the season term
+        state_id (int): State bit index, -1 to skip the state term, -2 for an unknown state
+        weather_impact (float): Weather adjustment shared by every crop
+        market (float64[:]): Market trend adjustment per crop
+        season_hit (bool[:]): Output, crop suits the month
+        state_hit (bool[:]): Output, crop suits the state
+        out (float64[:]): Output buffer for scores clipped to [30, 100]
+    """
+    for i in prange(base.size):
+        score = base[i] + weather_impact + market[i]
+        if month > 0:
+            season_hit[i] = (season_mask[i] >> month) & 1 == 1
+            score += 15.0 if season_hit[i] else -10.0
+        if state_id != -1:
+            state_hit[i] = state_id >= 0 and (state_mask[i] >> np.uint64(state_id)) & np.uint64(1) == 1
+            score += 10.0 if state_hit[i] else -5.0
+        out[i] = min(max(score, 30.0), 100.0)
+    return out
+
+
+def _score_crops_numpy(base, season_mask, state_mask, month, state_id, weather_impact, market,
+                       season_hit, state_hit, out):
+    """NumPy implementation of the crop scoring kernel"""
+    scores = base + weather_impact + market
+    if month > 0:
+        season_hit[:] = (season_mask >> np.uint16(month)) & 1
+        scores += np.where(season_hit, 15.0, -10.0)
+    if state_id != -1:
+        state_hit[:] = ((state_mask >> np.uint64(state_id)) & 1) if state_id >= 0 else False
+        scores += np.where(state_hit, 10.0, -5.0)
+    return np.clip(scores, 30.0, 100.0, out=out)
+
+
+if njit is not None:
+    score_crops = njit(cache=True, fastmath=True)(_score_crops_loop)
+else:
+    score_crops = _score_crops_numpy
+
+
+def warmup_kernels():
+    """
+    Run each kernel once so the first request doesn't pay the JIT compile cost
+    """
+    forecast_prices(
+        1.0,
+        np.ones(1, dtype=np.int8),
+        np.ones(1, dtype=np.int32),
+        np.zeros(1, dtype=np.float64),
+        np.ones(12, dtype=np.float64),
+        1.0,
+        np.empty(1, dtype=np.float64)
+    )
+    score_crops(
+        np.zeros(1, dtype=np.float64),
+        np.zeros(1, dtype=np.uint16),
+        np.zeros(1, dtype=np.uint64),
+        1,
+        0,
+        0.0,
+        np.zeros(1, dtype=np.float64),
+        np.zeros(1, dtype=bool),
+        np.zeros(1, dtype=bool),
+        np.empty(1, dtype=np.float64)
+    )
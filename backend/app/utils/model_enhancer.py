@@ -20,35 +20,37 @@ class ModelEnhancer:
             humidity = weather_data.get('humidity', 60)  # Default to 60%
             rainfall = weather_data.get('rainfall', 0)
             
-            # Adjust confidence scores based on weather conditions
-            predictions = base_prediction['predictions']
-            for crop in predictions:
-                score = predictions[crop]
+            # Weather multiplier, the same for every crop
+            factor = 1.0
+            
+            # Temperature adjustment
+            if 20 <= temperature <= 30:  # Optimal range
+                factor *= 1.1
+            elif temperature < 10 or temperature > 35:
+                factor *= 0.8
                 
-                # Temperature adjustment
-                if 20 <= temperature <= 30:  # Optimal range
-                    score *= 1.1
-                elif temperature < 10 or temperature > 35:
-                    score *= 0.8
-                    
-                # Humidity adjustment
-                if 50 <= humidity <= 70:  # Optimal range
-                    score *= 1.1
-                elif humidity < 30 or humidity > 90:
-                    score *= 0.9
-                    
-                # Rainfall impact
-                if 0 <= rainfall <= 30:  # Light rain
-                    score *= 1.05
-                elif rainfall > 100:  # Heavy rain
-                    score *= 0.7
-                    
-                predictions[crop] = min(score, 1.0)  # Cap at 1.0
+            # Humidity adjustment
+            if 50 <= humidity <= 70:  # Optimal range
+                factor *= 1.1
+            elif humidity < 30 or humidity > 90:
+                factor *= 0.9
+                
+            # Rainfall impact
+            if 0 <= rainfall <= 30:  # Light rain
+                factor *= 1.05
+            elif rainfall > 100:  # Heavy rain
+                factor *= 0.7
+            
+            # Adjust confidence scores of all crops at once, capped at 1.0
+            crops = list(base_prediction['predictions'])
+            scores = np.fromiter(base_prediction['predictions'].values(), dtype=np.float64, count=len(crops))
+            scores = np.minimum(scores * factor, 1.0)
                 
             # Normalize scores
-            total = sum(predictions.values())
+            total = scores.sum()
             if total > 0:
-                predictions = {k: v/total for k, v in predictions.items()}
+                scores /= total
+            predictions = dict(zip(crops, scores.tolist()))
                 
             base_prediction['predictions'] = predictions
             base_prediction['weather_context'] = {
@@ -0,0 +1,18 @@
+# Gunicorn configuration for the AgriTech API
+# Usage: gunicorn -c gunicorn_conf.py app:app
+
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+
+# gevent workers monkey-patch sockets so the blocking weather/geocoding calls
+# (requests uses the stdlib socket module) yield to other requests instead of
+# holding the worker
+worker_class = 'gevent'
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+worker_connections = 1000
+
+# Prophet fits can take a few seconds on a cold forecast
+timeout = 60
+keepalive = 5
@@ -0,0 +1,7 @@
+// Shared chart tooltip style (module scope so it isn't rebuilt on every render)
+export const tooltipStyle = {
+  backgroundColor: 'white',
+  border: '1px solid #e5e7eb',
+  borderRadius: '8px',
+  boxShadow: '0 4px 6px -1px rgba(0, 0, 0, 0.1)'
+}
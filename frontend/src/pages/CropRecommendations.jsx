@@ -1,4 +1,4 @@
-import React, { useState } from 'react'
+import React, { useMemo, useState } from 'react'
 import { motion, AnimatePresence } from 'framer-motion'
 import { 
   Sprout, 
@@ -18,6 +18,46 @@ import { agriTechAPI } from '../services/api'
 import toast from 'react-hot-toast'
 import { BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer } from 'recharts'
 import PageTransition from '../components/PageTransition'
+import { tooltipStyle } from '../components/chartStyles'
+
+const states = [
+  { value: 'Maharashtra', label: 'Maharashtra' },
+  { value: 'Karnataka', label: 'Karnataka' },
+  { value: 'Andhra Pradesh', label: 'Andhra Pradesh' },
+  { value: 'Tamil Nadu', label: 'Tamil Nadu' },
+  { value: 'Gujarat', label: 'Gujarat' },
+  { value: 'Rajasthan', label: 'Rajasthan' },
+  { value: 'Madhya Pradesh', label: 'Madhya Pradesh' },
+  { value: 'Uttar Pradesh', label: 'Uttar Pradesh' }
+]
+
+const crops = [
+  { value: 'Rice', label: 'Rice' },
+  { value: 'Wheat', label: 'Wheat' },
+  { value: 'Maize', label: 'Maize' },
+  { value: 'Cotton', label: 'Cotton' },
+  { value: 'Sugarcane', label: 'Sugarcane' },
+  { value: 'Onion', label: 'Onion' },
+  { value: 'Potato', label: 'Potato' },
+  { value: 'Tomato', label: 'Tomato' },
+  { value: 'Soybean', label: 'Soybean' },
+  { value: 'Groundnut', label: 'Groundnut' }
+]
+
+const months = [
+  { value: 1, label: 'January' },
+  { value: 2, label: 'February' },
+  { value: 3, label: 'March' },
+  { value: 4, label: 'April' },
+  { value: 5, label: 'May' },
+  { value: 6, label: 'June' },
+  { value: 7, label: 'July' },
+  { value: 8, label: 'August' },
+  { value: 9, label: 'September' },
+  { value: 10, label: 'October' },
+  { value: 11, label: 'November' },
+  { value: 12, label: 'December' }
+]
 
 const CropRecommendations = () => {
   const [mode, setMode] = useState('location') // 'location' or 'crop'
@@ -30,45 +70,6 @@ const CropRecommendations = () => {
     crop: 'Rice'
   })
 
-  const states = [
-    { value: 'Maharashtra', label: 'Maharashtra' },
-    { value: 'Karnataka', label: 'Karnataka' },
-    { value: 'Andhra Pradesh', label: 'Andhra Pradesh' },
-    { value: 'Tamil Nadu', label: 'Tamil Nadu' },
-    { value: 'Gujarat', label: 'Gujarat' },
-    { value: 'Rajasthan', label: 'Rajasthan' },
-    { value: 'Madhya Pradesh', label: 'Madhya Pradesh' },
-    { value: 'Uttar Pradesh', label: 'Uttar Pradesh' }
-  ]
-
-  const crops = [
-    { value: 'Rice', label: 'Rice' },
-    { value: 'Wheat', label: 'Wheat' },
-    { value: 'Maize', label: 'Maize' },
-    { value: 'Cotton', label: 'Cotton' },
-    { value: 'Sugarcane', label: 'Sugarcane' },
-    { value: 'Onion', label: 'Onion' },
-    { value: 'Potato', label: 'Potato' },
-    { value: 'Tomato', label: 'Tomato' },
-    { value: 'Soybean', label: 'Soybean' },
-    { value: 'Groundnut', label: 'Groundnut' }
-  ]
-
-  const months = [
-    { value: 1, label: 'January' },
-    { value: 2, label: 'February' },
-    { value: 3, label: 'March' },
-    { value: 4, label: 'April' },
-    { value: 5, label: 'May' },
-    { value: 6, label: 'June' },
-    { value: 7, label: 'July' },
-    { value: 8, label: 'August' },
-    { value: 9, label: 'September' },
-    { value: 10, label: 'October' },
-    { value: 11, label: 'November' },
-    { value: 12, label: 'December' }
-  ]
-
   const handleSubmit = async (e) => {
     e.preventDefault()
     setLoading(true)
@@ -108,12 +109,14 @@ const CropRecommendations = () => {
     return 'text-red-600 bg-red-100'
   }
 
-  const formatChartData = (recommendations) => {
-    return recommendations.map(rec => ({
+  // Only rebuild the chart series when new recommendations arrive, not on every form change
+  const chartData = useMemo(
+    () => (recommendations?.recommendations || []).map(rec => ({
       crop: rec.crop,
       score: rec.suitability_score
-    }))
-  }
+    })),
+    [recommendations]
+  )
 
   return (
     <PageTransition>
@@ -303,7 +306,7 @@ const CropRecommendations = () => {
                     </h3>
                     <div className="h-80">
                       <ResponsiveContainer width="100%" height="100%">
-                        <BarChart data={formatChartData(recommendations.recommendations)}>
+                        <BarChart data={chartData}>
                           <CartesianGrid strokeDasharray="3 3" stroke="#f0f0f0" />
                           <XAxis 
                             dataKey="crop" 
@@ -316,12 +319,7 @@ const CropRecommendations = () => {
                             domain={[0, 100]}
                           />
                       <Tooltip
-                        contentStyle={{
-                          backgroundColor: 'white',
-                          border: '1px solid #e5e7eb',
-                          borderRadius: '8px',
-                          boxShadow: '0 4px 6px -1px rgba(0, 0, 0, 0.1)'
-                        }}
+                        contentStyle={tooltipStyle}
                         formatter={(value) => [`${value}%`, 'Suitability Score']}
                       />
                           <Bar 
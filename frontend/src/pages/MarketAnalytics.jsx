@@ -1,4 +1,4 @@
-import React, { useState } from 'react'
+import React, { memo, useState } from 'react'
 import { motion } from 'framer-motion'
 import { 
   BarChart3, 
@@ -27,91 +27,163 @@ import {
   Legend
 } from 'recharts'
 import PageTransition from '../components/PageTransition'
+import { tooltipStyle } from '../components/chartStyles'
 
-const MarketAnalytics = () => {
-  const [timeRange, setTimeRange] = useState('6months')
-  const [selectedCrop, setSelectedCrop] = useState('Rice')
+// Sample data - in real app, this would come from API
+const priceTrendsData = [
+  { month: 'Jan', Rice: 2200, Wheat: 1950, Maize: 1650 },
+  { month: 'Feb', Rice: 2250, Wheat: 2000, Maize: 1700 },
+  { month: 'Mar', Rice: 2300, Wheat: 2050, Maize: 1750 },
+  { month: 'Apr', Rice: 2350, Wheat: 2100, Maize: 1800 },
+  { month: 'May', Rice: 2400, Wheat: 2150, Maize: 1850 },
+  { month: 'Jun', Rice: 2450, Wheat: 2200, Maize: 1900 },
+  { month: 'Jul', Rice: 2500, Wheat: 2250, Maize: 1950 },
+  { month: 'Aug', Rice: 2550, Wheat: 2300, Maize: 2000 },
+  { month: 'Sep', Rice: 2600, Wheat: 2350, Maize: 2050 }
+]
 
-  // Sample data - in real app, this would come from API
-  const priceTrendsData = [
-    { month: 'Jan', Rice: 2200, Wheat: 1950, Maize: 1650 },
-    { month: 'Feb', Rice: 2250, Wheat: 2000, Maize: 1700 },
-    { month: 'Mar', Rice: 2300, Wheat: 2050, Maize: 1750 },
-    { month: 'Apr', Rice: 2350, Wheat: 2100, Maize: 1800 },
-    { month: 'May', Rice: 2400, Wheat: 2150, Maize: 1850 },
-    { month: 'Jun', Rice: 2450, Wheat: 2200, Maize: 1900 },
-    { month: 'Jul', Rice: 2500, Wheat: 2250, Maize: 1950 },
-    { month: 'Aug', Rice: 2550, Wheat: 2300, Maize: 2000 },
-    { month: 'Sep', Rice: 2600, Wheat: 2350, Maize: 2050 }
-  ]
+const cropDistributionData = [
+  { name: 'Rice', value: 25, color: '#667eea' },
+  { name: 'Wheat', value: 22, color: '#764ba2' },
+  { name: 'Maize', value: 18, color: '#ff6b6b' },
+  { name: 'Cotton', value: 15, color: '#4ecdc4' },
+  { name: 'Others', value: 20, color: '#45b7d1' }
+]
 
-  const cropDistributionData = [
-    { name: 'Rice', value: 25, color: '#667eea' },
-    { name: 'Wheat', value: 22, color: '#764ba2' },
-    { name: 'Maize', value: 18, color: '#ff6b6b' },
-    { name: 'Cotton', value: 15, color: '#4ecdc4' },
-    { name: 'Others', value: 20, color: '#45b7d1' }
-  ]
+const statePerformanceData = [
+  { state: 'Maharashtra', yield: 4.2, price: 2400, trend: 5.2 },
+  { state: 'Karnataka', yield: 3.8, price: 2350, trend: 3.8 },
+  { state: 'Andhra Pradesh', yield: 4.5, price: 2500, trend: 6.1 },
+  { state: 'Tamil Nadu', yield: 4.0, price: 2450, trend: 4.5 },
+  { state: 'Gujarat', yield: 3.6, price: 2300, trend: 2.9 },
+  { state: 'Rajasthan', yield: 3.2, price: 2200, trend: 1.8 }
+]
 
-  const statePerformanceData = [
-    { state: 'Maharashtra', yield: 4.2, price: 2400, trend: 5.2 },
-    { state: 'Karnataka', yield: 3.8, price: 2350, trend: 3.8 },
-    { state: 'Andhra Pradesh', yield: 4.5, price: 2500, trend: 6.1 },
-    { state: 'Tamil Nadu', yield: 4.0, price: 2450, trend: 4.5 },
-    { state: 'Gujarat', yield: 3.6, price: 2300, trend: 2.9 },
-    { state: 'Rajasthan', yield: 3.2, price: 2200, trend: 1.8 }
-  ]
+const marketInsights = [
+  {
+    type: 'hot',
+    title: 'Hot Markets',
+    icon: TrendingUp,
+    color: 'green',
+    items: [
+      'Cotton prices rising 15%',
+      'Onion demand increasing',
+      'Export opportunities for Rice'
+    ]
+  },
+  {
+    type: 'alert',
+    title: 'Market Alerts',
+    icon: AlertTriangle,
+    color: 'yellow',
+    items: [
+      'Monsoon affecting Wheat',
+      'Storage issues with Potato',
+      'Transportation costs up 8%'
+    ]
+  },
+  {
+    type: 'event',
+    title: 'Upcoming Events',
+    icon: Calendar,
+    color: 'blue',
+    items: [
+      'Harvest season begins Oct',
+      'New MSP announcement',
+      'Agricultural expo next month'
+    ]
+  }
+]
 
-  const marketInsights = [
-    {
-      type: 'hot',
-      title: 'Hot Markets',
-      icon: TrendingUp,
-      color: 'green',
-      items: [
-        'Cotton prices rising 15%',
-        'Onion demand increasing',
-        'Export opportunities for Rice'
-      ]
-    },
-    {
-      type: 'alert',
-      title: 'Market Alerts',
-      icon: AlertTriangle,
-      color: 'yellow',
-      items: [
-        'Monsoon affecting Wheat',
-        'Storage issues with Potato',
-        'Transportation costs up 8%'
-      ]
-    },
-    {
-      type: 'event',
-      title: 'Upcoming Events',
-      icon: Calendar,
-      color: 'blue',
-      items: [
-        'Harvest season begins Oct',
-        'New MSP announcement',
-        'Agricultural expo next month'
-      ]
-    }
-  ]
+const crops = [
+  { value: 'Rice', label: 'Rice' },
+  { value: 'Wheat', label: 'Wheat' },
+  { value: 'Maize', label: 'Maize' },
+  { value: 'Cotton', label: 'Cotton' },
+  { value: 'Sugarcane', label: 'Sugarcane' }
+]
 
-  const crops = [
-    { value: 'Rice', label: 'Rice' },
-    { value: 'Wheat', label: 'Wheat' },
-    { value: 'Maize', label: 'Maize' },
-    { value: 'Cotton', label: 'Cotton' },
-    { value: 'Sugarcane', label: 'Sugarcane' }
-  ]
+const timeRanges = [
+  { value: '3months', label: '3 Months' },
+  { value: '6months', label: '6 Months' },
+  { value: '1year', label: '1 Year' },
+  { value: '2years', label: '2 Years' }
+]
 
-  const timeRanges = [
-    { value: '3months', label: '3 Months' },
-    { value: '6months', label: '6 Months' },
-    { value: '1year', label: '1 Year' },
-    { value: '2years', label: '2 Years' }
-  ]
+const formatRupees = (value) => `₹${value}`
+const formatRupeesTooltip = (value, name) => [`₹${value}`, name]
+const formatPercentTooltip = (value, name) => [`${value}%`, name]
+
+// The charts only depend on module-level data, so memo() keeps them from
+// re-rendering when the crop / time range selection changes
+const PriceTrendsChart = memo(function PriceTrendsChart() {
+  return (
+    <ResponsiveContainer width="100%" height="100%">
+      <LineChart data={priceTrendsData}>
+        <CartesianGrid strokeDasharray="3 3" stroke="#f0f0f0" />
+        <XAxis dataKey="month" stroke="#666" fontSize={12} />
+        <YAxis stroke="#666" fontSize={12} tickFormatter={formatRupees} />
+        <Tooltip
+          contentStyle={tooltipStyle}
+          formatter={formatRupeesTooltip}
+        />
+        <Legend />
+        <Line type="monotone" dataKey="Rice" stroke="#667eea" strokeWidth={3} />
+        <Line type="monotone" dataKey="Wheat" stroke="#764ba2" strokeWidth={3} />
+        <Line type="monotone" dataKey="Maize" stroke="#ff6b6b" strokeWidth={3} />
+      </LineChart>
+    </ResponsiveContainer>
+  )
+})
+
+const CropDistributionChart = memo(function CropDistributionChart() {
+  return (
+    <ResponsiveContainer width="100%" height="100%">
+      <PieChart>
+        <Pie
+          data={cropDistributionData}
+          cx="50%"
+          cy="50%"
+          innerRadius={60}
+          outerRadius={120}
+          paddingAngle={5}
+          dataKey="value"
+        >
+          {cropDistributionData.map((entry, index) => (
+            <Cell key={`cell-${index}`} fill={entry.color} />
+          ))}
+        </Pie>
+        <Tooltip
+          contentStyle={tooltipStyle}
+          formatter={formatPercentTooltip}
+        />
+        <Legend />
+      </PieChart>
+    </ResponsiveContainer>
+  )
+})
+
+const StatePerformanceChart = memo(function StatePerformanceChart() {
+  return (
+    <ResponsiveContainer width="100%" height="100%">
+      <BarChart data={statePerformanceData}>
+        <CartesianGrid strokeDasharray="3 3" stroke="#f0f0f0" />
+        <XAxis dataKey="state" stroke="#666" fontSize={12} />
+        <YAxis stroke="#666" fontSize={12} />
+        <Tooltip
+          contentStyle={tooltipStyle}
+        />
+        <Legend />
+        <Bar dataKey="yield" fill="#667eea" name="Yield (T/Ha)" />
+        <Bar dataKey="trend" fill="#764ba2" name="Growth %" />
+      </BarChart>
+    </ResponsiveContainer>
+  )
+})
+
+const MarketAnalytics = () => {
+  const [timeRange, setTimeRange] = useState('6months')
+  const [selectedCrop, setSelectedCrop] = useState('Rice')
 
   return (
     <PageTransition>
@@ -224,26 +296,7 @@ const MarketAnalytics = () => {
           <Card>
             <h3 className="text-xl font-bold text-gray-900 mb-4">Price Trends</h3>
             <div className="h-80">
-              <ResponsiveContainer width="100%" height="100%">
-                <LineChart data={priceTrendsData}>
-                  <CartesianGrid strokeDasharray="3 3" stroke="#f0f0f0" />
-                  <XAxis dataKey="month" stroke="#666" fontSize={12} />
-                  <YAxis stroke="#666" fontSize={12} tickFormatter={(value) => `₹${value}`} />
-                  <Tooltip
-                    contentStyle={{
-                      backgroundColor: 'white',
-                      border: '1px solid #e5e7eb',
-                      borderRadius: '8px',
-                      boxShadow: '0 4px 6px -1px rgba(0, 0, 0, 0.1)'
-                    }}
-                    formatter={(value, name) => [`₹${value}`, name]}
-                  />
-                  <Legend />
-                  <Line type="monotone" dataKey="Rice" stroke="#667eea" strokeWidth={3} />
-                  <Line type="monotone" dataKey="Wheat" stroke="#764ba2" strokeWidth={3} />
-                  <Line type="monotone" dataKey="Maize" stroke="#ff6b6b" strokeWidth={3} />
-                </LineChart>
-              </ResponsiveContainer>
+              <PriceTrendsChart />
             </div>
           </Card>
         </motion.div>
@@ -257,33 +310,7 @@ const MarketAnalytics = () => {
           <Card>
             <h3 className="text-xl font-bold text-gray-900 mb-4">Crop Area Distribution</h3>
             <div className="h-80">
-              <ResponsiveContainer width="100%" height="100%">
-                <PieChart>
-                  <Pie
-                    data={cropDistributionData}
-                    cx="50%"
-                    cy="50%"
-                    innerRadius={60}
-                    outerRadius={120}
-                    paddingAngle={5}
-                    dataKey="value"
-                  >
-                    {cropDistributionData.map((entry, index) => (
-                      <Cell key={`cell-${index}`} fill={entry.color} />
-                    ))}
-                  </Pie>
-                  <Tooltip
-                    contentStyle={{
-                      backgroundColor: 'white',
-                      border: '1px solid #e5e7eb',
-                      borderRadius: '8px',
-                      boxShadow: '0 4px 6px -1px rgba(0, 0, 0, 0.1)'
-                    }}
-                    formatter={(value, name) => [`${value}%`, name]}
-                  />
-                  <Legend />
-                </PieChart>
-              </ResponsiveContainer>
+              <CropDistributionChart />
             </div>
           </Card>
         </motion.div>
@@ -298,24 +325,7 @@ const MarketAnalytics = () => {
         <Card>
           <h3 className="text-xl font-bold text-gray-900 mb-4">State Performance</h3>
           <div className="h-80">
-            <ResponsiveContainer width="100%" height="100%">
-              <BarChart data={statePerformanceData}>
-                <CartesianGrid strokeDasharray="3 3" stroke="#f0f0f0" />
-                <XAxis dataKey="state" stroke="#666" fontSize={12} />
-                <YAxis stroke="#666" fontSize={12} />
-                <Tooltip
-                  contentStyle={{
-                    backgroundColor: 'white',
-                    border: '1px solid #e5e7eb',
-                    borderRadius: '8px',
-                    boxShadow: '0 4px 6px -1px rgba(0, 0, 0, 0.1)'
-                  }}
-                />
-                <Legend />
-                <Bar dataKey="yield" fill="#667eea" name="Yield (T/Ha)" />
-                <Bar dataKey="trend" fill="#764ba2" name="Growth %" />
-              </BarChart>
-            </ResponsiveContainer>
+            <StatePerformanceChart />
           </div>
         </Card>
       </motion.div>
@@ -1,4 +1,4 @@
-import React, { useState } from 'react'
+import React, { useMemo, useState } from 'react'
 import { motion } from 'framer-motion'
 import { 
   TrendingUp, 
@@ -14,6 +14,31 @@ import { agriTechAPI } from '../services/api'
 import toast from 'react-hot-toast'
 import { LineChart, Line, XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer } from 'recharts'
 import PageTransition from '../components/PageTransition'
+import { tooltipStyle } from '../components/chartStyles'
+
+// Created once; toLocaleDateString would build a new formatter for every point
+const chartDateFormat = new Intl.DateTimeFormat('en-US', { month: 'short', day: 'numeric' })
+
+const formatChartData = (predictions) => {
+  return predictions.map(pred => ({
+    date: chartDateFormat.format(new Date(pred.date)),
+    price: pred.price,
+    fullDate: pred.date
+  }))
+}
+
+const crops = [
+  { value: 'Rice', label: 'Rice' },
+  { value: 'Wheat', label: 'Wheat' },
+  { value: 'Maize', label: 'Maize' },
+  { value: 'Cotton', label: 'Cotton' },
+  { value: 'Sugarcane', label: 'Sugarcane' },
+  { value: 'Onion', label: 'Onion' },
+  { value: 'Potato', label: 'Potato' },
+  { value: 'Tomato', label: 'Tomato' },
+  { value: 'Soybean', label: 'Soybean' },
+  { value: 'Groundnut', label: 'Groundnut' }
+]
 
 const PriceForecast = () => {
   const [formData, setFormData] = useState({
@@ -23,19 +48,6 @@ const PriceForecast = () => {
   const [loading, setLoading] = useState(false)
   const [forecastData, setForecastData] = useState(null)
 
-  const crops = [
-    { value: 'Rice', label: 'Rice' },
-    { value: 'Wheat', label: 'Wheat' },
-    { value: 'Maize', label: 'Maize' },
-    { value: 'Cotton', label: 'Cotton' },
-    { value: 'Sugarcane', label: 'Sugarcane' },
-    { value: 'Onion', label: 'Onion' },
-    { value: 'Potato', label: 'Potato' },
-    { value: 'Tomato', label: 'Tomato' },
-    { value: 'Soybean', label: 'Soybean' },
-    { value: 'Groundnut', label: 'Groundnut' }
-  ]
-
   const handleSubmit = async (e) => {
     e.preventDefault()
     setLoading(true)
@@ -51,14 +63,11 @@ const PriceForecast = () => {
     }
   }
 
-  const formatChartData = (predictions) => {
-    return predictions.map(pred => ({
-      date: new Date(pred.date).toLocaleDateString('en-US', { month: 'short', day: 'numeric' }),
-      price: pred.price,
-      fullDate: pred.date
-    }))
-  }
-
+  // Only rebuild the chart series when a new forecast arrives, not on every form change
+  const chartData = useMemo(
+    () => (forecastData ? formatChartData(forecastData.predictions) : []),
+    [forecastData]
+  )
 
   return (
     <PageTransition>
@@ -178,7 +187,7 @@ const PriceForecast = () => {
                 </h3>
                 <div className="h-80">
                   <ResponsiveContainer width="100%" height="100%">
-                    <LineChart data={formatChartData(forecastData.predictions)}>
+                    <LineChart data={chartData}>
                       <CartesianGrid strokeDasharray="3 3" stroke="#f0f0f0" />
                       <XAxis 
                         dataKey="date" 
@@ -191,12 +200,7 @@ const PriceForecast = () => {
                         tickFormatter={(value) => `₹${value}`}
                       />
                       <Tooltip
-                        contentStyle={{
-                          backgroundColor: 'white',
-                          border: '1px solid #e5e7eb',
-                          borderRadius: '8px',
-                          boxShadow: '0 4px 6px -1px rgba(0, 0, 0, 0.1)'
-                        }}
+                        contentStyle={tooltipStyle}
                         formatter={(value) => [`₹${value}`, 'Price']}
                         labelFormatter={(label) => `Date: ${label}`}
                       />
@@ -33,6 +33,43 @@ api.interceptors.response.use(
   }
 )
 
+// Short-lived cache of POST responses keyed by endpoint + payload, so
+// re-rendering a page with the same inputs doesn't repeat the request.
+// In-flight requests are shared as well.
+const CACHE_TTL_MS = 10 * 60 * 1000
+const CACHE_MAX_ENTRIES = 256
+const responseCache = new Map()
+
+const stableStringify = (value) => {
+  if (Array.isArray(value)) {
+    return `[${value.map(stableStringify).join(',')}]`
+  }
+  if (value && typeof value === 'object') {
+    return `{${Object.keys(value).sort().map((key) => `${JSON.stringify(key)}:${stableStringify(value[key])}`).join(',')}}`
+  }
+  return JSON.stringify(value)
+}
+
+const cachedPost = (url, data) => {
+  const key = `${url}|${stableStringify(data)}`
+  const cached = responseCache.get(key)
+  if (cached && cached.expires > Date.now()) {
+    return cached.promise
+  }
+
+  const promise = api.post(url, data).then((response) => response.data)
+  // Failed requests are not cached
+  promise.catch(() => responseCache.delete(key))
+
+  responseCache.delete(key)
+  responseCache.set(key, { promise, expires: Date.now() + CACHE_TTL_MS })
+  if (responseCache.size > CACHE_MAX_ENTRIES) {
+    // Maps iterate in insertion order, so the first key is the oldest
+    responseCache.delete(responseCache.keys().next().value)
+  }
+  return promise
+}
+
 export const agriTechAPI = {
   // Health check
   async healthCheck() {
@@ -47,21 +84,31 @@ export const agriTechAPI = {
   // Price forecasting
   async forecastPrice(crop, days = 15) {
     try {
-      const response = await api.post('/forecast-price', {
+      return await cachedPost('/forecast-price', {
         crop,
         days
       })
-      return response.data
     } catch (error) {
       throw new Error(error.response?.data?.error || 'Failed to get price forecast')
     }
   },
 
+  // Price forecasts for several crops in a single request
+  // requests: [{ crop, days, district }]
+  async forecastPriceBatch(requests) {
+    try {
+      return await cachedPost('/forecast-price-batch', {
+        requests
+      })
+    } catch (error) {
+      throw new Error(error.response?.data?.error || 'Failed to get price forecasts')
+    }
+  },
+
   // Crop recommendations
   async recommendCrops(data) {
     try {
-      const response = await api.post('/recommend-crop', data)
-      return response.data
+      return await cachedPost('/recommend-crop', data)
     } catch (error) {
       throw new Error(error.response?.data?.error || 'Failed to get crop recommendations')
     }